@@ -39,7 +39,7 @@ Please only respond with valid json.
 """
 
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
-anthropic_client = Anthropic(api_key=ANTHROPIC_API_KEY)
+anthropic_client = Anthropic(api_key=ANTHROPIC_API_KEY, max_retries=5)
 
 
 @app.post("/frame_classification")
@@ -57,7 +57,7 @@ async def classify_frame(
         messages=[
             {
                 "role": "user",
-                "content": [frame.b64_encoding(output_format="anthropic")],
+                "content": [frame.b64_encoding(output_format="anthropic", max_size=768)],
             }
         ],
     )
@@ -1,7 +1,9 @@
+import asyncio
 import os
 
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 from encord.objects.ontology_labels_impl import LabelRowV2
+from encord.objects.ontology_object_instance import ObjectInstance
 from fastapi import Depends, FastAPI
 from typing_extensions import Annotated
 
@@ -41,7 +43,42 @@ Please only respond with valid json.
 
 # Claude setup
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
-anthropic_client = Anthropic(api_key=ANTHROPIC_API_KEY)
+anthropic_client = AsyncAnthropic(api_key=ANTHROPIC_API_KEY, max_retries=5)
+# Upper bound on the number of concurrent requests to Claude
+claude_semaphore = asyncio.Semaphore(10)
+
+
+async def classify_crop(crop: InstanceCrop) -> ObjectInstance | None:
+    """Query Claude for a single crop and parse the answer."""
+    async with claude_semaphore:
+        message = await anthropic_client.messages.create(
+            model="claude-3-haiku-20240307",
+            max_tokens=1024,
+            # The schema prompt is identical for every crop, so let Claude cache it.
+            system=[
+                {
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+            messages=[
+                {
+                    "role": "user",
+                    "content": [crop.b64_encoding(output_format="anthropic", max_size=768)],
+                }
+            ],
+        )
+
+    # Parse result
+    try:
+        return data_model(message.content[0].text)
+    except Exception:
+        import traceback
+
+        traceback.print_exc()
+        print(f"Response from model: {message.content[0].text}")
+        return None
 
 
 @app.post("/object_classification")
@@ -54,40 +91,25 @@ async def classify_objects(
     ],
 ):
     """Classify generic objects using Claude."""
-    # Query Claude for each crop
+    # Query Claude for all crops concurrently
+    instances = await asyncio.gather(*[classify_crop(crop) for crop in crops])
+
+    # Replace the generic objects with the classified ones
     changes = False
-    for crop in crops:
-        message = anthropic_client.messages.create(
-            model="claude-3-haiku-20240307",
-            max_tokens=1024,
-            system=system_prompt,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [crop.b64_encoding(output_format="anthropic")],
-                }
-            ],
-        )
+    for crop, instance in zip(crops, instances):
+        if instance is None:
+            continue
 
-        # Parse result
-        try:
-            instance = data_model(message.content[0].text)
-
-            coordinates = crop.instance.get_annotation(frame=frame_data.frame).coordinates
-            instance.set_for_frames(
-                coordinates=coordinates,
-                frames=frame_data.frame,
-                confidence=0.5,
-                manual_annotation=False,
-            )
-            lr.remove_object(crop.instance)
-            lr.add_object_instance(instance)
-            changes = True
-        except Exception:
-            import traceback
-
-            traceback.print_exc()
-            print(f"Response from model: {message.content[0].text}")
+        coordinates = crop.instance.get_annotation(frame=frame_data.frame).coordinates
+        instance.set_for_frames(
+            coordinates=coordinates,
+            frames=frame_data.frame,
+            confidence=0.5,
+            manual_annotation=False,
+        )
+        lr.remove_object(crop.instance)
+        lr.add_object_instance(instance)
+        changes = True
 
     # Save changes
     if changes:
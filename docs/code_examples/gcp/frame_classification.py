@@ -30,7 +30,7 @@ Please only respond with valid json.
 
 # Prompts
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
-anthropic_client = Anthropic(api_key=ANTHROPIC_API_KEY)
+anthropic_client = Anthropic(api_key=ANTHROPIC_API_KEY, max_retries=5)
 
 
 @editor_agent()
@@ -47,7 +47,7 @@ def agent(
         messages=[
             {
                 "role": "user",
-                "content": [frame.b64_encoding(output_format="anthropic")],
+                "content": [frame.b64_encoding(output_format="anthropic", max_size=768)],
             }
         ],
     )
@@ -31,7 +31,7 @@ Please only respond with valid json.
 
 # Claude
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
-anthropic_client = Anthropic(api_key=ANTHROPIC_API_KEY)
+anthropic_client = Anthropic(api_key=ANTHROPIC_API_KEY, max_retries=5)
 
 
 # Setup agent
@@ -54,7 +54,7 @@ def agent(
             messages=[
                 {
                     "role": "user",
-                    "content": [crop.b64_encoding(output_format="anthropic")],
+                    "content": [crop.b64_encoding(output_format="anthropic", max_size=768)],
                 }
             ],
         )
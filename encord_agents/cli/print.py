@@ -3,7 +3,7 @@ import sys
 from encord.orm.workflow import WorkflowStageType
 from typer import Typer
 
-from encord_agents.core.settings import Settings
+from encord_agents.core.settings import get_settings
 
 app = Typer(
     name="print",
@@ -28,7 +28,7 @@ def print_agent_nodes(project_hash: str) -> None:
     from encord.exceptions import AuthorisationError
     from encord.user_client import EncordUserClient
 
-    _ = Settings()
+    _ = get_settings()
     client = EncordUserClient.create_with_ssh_private_key()
     try:
         project = client.get_project(project_hash)
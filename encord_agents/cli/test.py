@@ -3,7 +3,18 @@ CLI utilities for testing agents.
 """
 
 import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import urlparse
+from uuid import UUID
 
+import requests
+from requests.adapters import HTTPAdapter
 from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
 from rich.table import Table
 from typer import Argument, Option, Typer
@@ -16,6 +27,125 @@ app = Typer(
     no_args_is_help=True,
 )
 
+EDITOR_URL_HOST = "app.encord.com"
+EDITOR_URL_PATH_PREFIX = "/label_editor/"
+MAX_CONNECTIONS = 8
+
+
+def parse_editor_url(editor_url: str) -> dict[str, str | int]:
+    """
+    Read the project hash, data hash, and frame from a url copied from the Label Editor.
+
+    Args:
+        editor_url: A url of the form `https://app.encord.com/label_editor/{project_hash}/{data_hash}(/{frame})`.
+            Query strings and fragments are ignored.
+
+    Returns:
+        A payload with the `projectHash`, `dataHash`, and `frame` keys that agents expect.
+        The frame defaults to 0 if it's not part of the url.
+
+    Raises:
+        ValueError: If the url doesn't have the expected format.
+    """
+    parsed = urlparse(editor_url)
+    if parsed.scheme != "https" or parsed.netloc != EDITOR_URL_HOST:
+        raise ValueError(f"Not a label editor url: `{editor_url}`")
+    if not parsed.path.startswith(EDITOR_URL_PATH_PREFIX):
+        raise ValueError(f"Not a label editor url: `{editor_url}`")
+
+    tail = parsed.path[len(EDITOR_URL_PATH_PREFIX) :]
+    project_hash, _, tail = tail.partition("/")
+    data_hash, _, tail = tail.partition("/")
+    frame, _, _ = tail.partition("/")
+
+    if not project_hash:
+        raise ValueError(f"Could not read project hash from `{editor_url}`")
+    try:
+        data_hash = str(UUID(data_hash))
+    except ValueError as err:
+        raise ValueError(f"Could not read data hash from `{editor_url}`") from err
+    # `int` also accepts signs, whitespace, underscores, and non-ascii digits
+    if frame and not (frame.isascii() and frame.isdecimal()):
+        raise ValueError(f"Could not read frame from `{editor_url}`")
+
+    return {
+        "projectHash": project_hash,
+        "dataHash": data_hash,
+        "frame": int(frame) if frame else 0,
+    }
+
+
+def create_session(pool_size: int = MAX_CONNECTIONS) -> requests.Session:
+    """
+    Create a session that keeps connections to the agent alive and reuses them across requests.
+
+    Args:
+        pool_size: The number of connections to keep alive. Should be at least the number
+            of requests that are sent concurrently, otherwise connections are discarded.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    """
+    Get the session used to hit agent endpoints.
+
+    The session is shared, such that connections to the agent are kept alive and reused across requests.
+    """
+    return create_session()
+
+
+def get_local_endpoint(target: str, port: int) -> str:
+    """Get the url of the `target` endpoint of an agent running on localhost."""
+    if target and not target[0] == "/":
+        target = f"/{target}"
+    return f"http://localhost:{port}{target}"
+
+
+def hit_endpoint(
+    endpoint: str, payload: dict[str, str | int], session: requests.Session | None = None
+) -> tuple[requests.PreparedRequest, requests.Response]:
+    """
+    Post a payload to an agent endpoint via the shared session.
+
+    Args:
+        endpoint: The full url of the agent endpoint.
+        payload: The json payload, e.g., from `parse_editor_url`.
+        session: The session to send the request with. Defaults to `get_session()`.
+
+    Returns:
+        The request that was sent and the response from the agent.
+    """
+    request = requests.Request(
+        "POST",
+        endpoint,
+        json=payload,
+        headers={"Content-type": "application/json"},
+    )
+    prepped = request.prepare()
+    return prepped, (session or get_session()).send(prepped)
+
+
+@contextmanager
+def progress_spinner(description: str) -> Iterator[None]:
+    """
+    Show a spinner while the body of the context is running.
+
+    The spinner is skipped when stdout is not a terminal, e.g., when the output is piped.
+    """
+    if not sys.stdout.isatty():
+        yield
+        return
+
+    with Progress(SpinnerColumn(), TextColumn("{task.description}"), TimeElapsedColumn()) as progress:
+        progress.add_task(description)
+        yield
+
 
 @app.command(
     "local",
@@ -44,24 +174,14 @@ def local(
         "frame": [green]frame[/green] or 0
     }
     """
-    import re
-    import sys
     from pprint import pprint
 
-    import requests
     import rich
     import typer
 
-    parts_regex = r"https:\/\/app.encord.com\/label_editor\/(?P<projectHash>.*?)\/(?P<dataHash>[\w\d]{8}-[\w\d]{4}-[\w\d]{4}-[\w\d]{4}-[\w\d]{12})(/(?P<frame>\d+))?\??"
-
     try:
-        match = re.match(parts_regex, url)
-        if match is None:
-            raise typer.Abort()
-
-        payload = match.groupdict()
-        payload["frame"] = payload["frame"] or 0
-    except Exception:
+        payload = parse_editor_url(url)
+    except ValueError:
         rich.print(
             """Could not match url to the expected format.
 Format is expected to be [blue]https://app.encord.com/label_editor/[magenta]{project_hash}[/magenta]/[magenta]{data_hash}[/magenta](/[magenta]{frame}[/magenta])[/blue]
@@ -70,53 +190,104 @@ Format is expected to be [blue]https://app.encord.com/label_editor/[magenta]{pro
         )
         raise typer.Abort()
 
-    if target and not target[0] == "/":
-        target = f"/{target}"
+    endpoint = get_local_endpoint(target, port)
+    with progress_spinner(f"Hitting agent endpoint `[blue]{endpoint}[/blue]`"):
+        start = time.perf_counter()
+        prepped, response = hit_endpoint(endpoint, payload)
+        time_elapsed = time.perf_counter() - start
 
-    with requests.Session() as sess:
-        request = requests.Request(
-            "POST",
-            f"http://localhost:{port}{target}",
-            json=payload,
-            headers={"Content-type": "application/json"},
-        )
-        prepped = request.prepare()
-
-        with Progress(SpinnerColumn(), TextColumn("{task.description}"), TimeElapsedColumn()) as progress:
-            task = progress.add_task(f"Hitting agent endpoint `[blue]{prepped.url}[/blue]`")
-            response = sess.send(prepped)
-            progress.update(task, advance=1)
-            time_elapsed = progress.get_time()
-
-        table = Table()
-
-        table.add_column("Property", style="bold")
-        table.add_column("Value")
-
-        table.add_section()
-        table.add_row("[green]Request[/green]")
-        table.add_row("url", prepped.url)
-        body_json_str = prepped.body.decode("utf-8")  # type: ignore
-        table.add_row("data", body_json_str)
-        table_headers = ", ".join([f"'{k}': '{v}'" for k, v in prepped.headers.items()])
-        table.add_row("headers", f"{{{table_headers}}}")
-
-        table.add_section()
-        table.add_row("[green]Response[/green]")
-        table.add_row("status code", str(response.status_code))
-        table.add_row("response", response.text)
-        table.add_row("elapsed time", f"{time_elapsed / 1000 / 1000:.4f}s")
-
-        table.add_section()
-        table.add_row("[green]Utilities[/green]")
-        editor_url = (
-            f"https://app.encord.com/label_editor/{payload['projectHash']}/{payload['dataHash']}/{payload['frame']}"
-        )
-        table.add_row("label editor", editor_url)
+    table = Table()
+
+    table.add_column("Property", style="bold")
+    table.add_column("Value")
+
+    table.add_section()
+    table.add_row("[green]Request[/green]")
+    table.add_row("url", prepped.url)
+    body_json_str = prepped.body.decode("utf-8")  # type: ignore
+    table.add_row("data", body_json_str)
+    table_headers = ", ".join([f"'{k}': '{v}'" for k, v in prepped.headers.items()])
+    table.add_row("headers", f"{{{table_headers}}}")
+
+    table.add_section()
+    table.add_row("[green]Response[/green]")
+    table.add_row("status code", str(response.status_code))
+    table.add_row("response", response.text)
+    table.add_row("elapsed time", f"{time_elapsed:.4f}s")
+
+    table.add_section()
+    table.add_row("[green]Utilities[/green]")
+    editor_url = (
+        f"https://app.encord.com/label_editor/{payload['projectHash']}/{payload['dataHash']}/{payload['frame']}"
+    )
+    table.add_row("label editor", editor_url)
+
+    headers = ["'{0}: {1}'".format(k, v) for k, v in prepped.headers.items()]
+    str_headers = " -H ".join(headers)
+    curl_command = f"curl -X {prepped.method} \\{os.linesep}  -H {str_headers} \\{os.linesep}  -d '{body_json_str}' \\{os.linesep}  '{prepped.url}'"
+    table.add_row("curl", curl_command)
+
+    rich.print(table)
+
+
+@app.command(
+    "batch",
+    short_help="Hit a localhost agents endpoint with many label editor urls",
+)
+def batch(
+    target: Annotated[
+        str,
+        Argument(help="Name of the localhost endpoint to hit ('http://localhost/{target}')"),
+    ],
+    urls_file: Annotated[
+        Path,
+        Argument(help="File with one url copy/pasted from label editor per line", exists=True, dir_okay=False),
+    ],
+    port: Annotated[int, Option(help="Local host port to hit")] = 8080,
+    num_workers: Annotated[int, Option(help="Number of requests to send concurrently")] = MAX_CONNECTIONS,
+) -> None:
+    """Hit a localhost agents endpoint once for every label editor url in a file.
+
+    Every line in [green]urls_file[/green] is parsed like the url of the [blue]`local`[/blue] command.
+    The requests are sent concurrently over a shared pool of connections and
+    the responses are summarised in one table once all of them have returned.
+    """
+    import rich
+    import typer
+
+    urls = [line.strip() for line in urls_file.read_text().splitlines() if line.strip()]
+    payloads: list[dict[str, str | int]] = []
+    for url in urls:
+        try:
+            payloads.append(parse_editor_url(url))
+        except ValueError:
+            rich.print(f"Could not match url to the expected format: [blue]{url}[/blue]", file=sys.stderr)
+            raise typer.Abort()
+
+    endpoint = get_local_endpoint(target, port)
+    num_workers = max(1, num_workers)
+
+    def _hit(payload: dict[str, str | int]) -> tuple[str, str, float]:
+        start = time.perf_counter()
+        try:
+            _, response = hit_endpoint(endpoint, payload, session)
+            status, text = str(response.status_code), response.text
+        except requests.RequestException as e:
+            status, text = "[red]failed[/red]", str(e)
+        return status, text, time.perf_counter() - start
+
+    # One connection per worker, such that every worker can keep its connection alive
+    with create_session(num_workers) as session:
+        with progress_spinner(f"Hitting agent endpoint `[blue]{endpoint}[/blue]` {len(payloads)} times"):
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                results = list(executor.map(_hit, payloads))
 
-        headers = ["'{0}: {1}'".format(k, v) for k, v in prepped.headers.items()]
-        str_headers = " -H ".join(headers)
-        curl_command = f"curl -X {prepped.method} \\{os.linesep}  -H {str_headers} \\{os.linesep}  -d '{body_json_str}' \\{os.linesep}  '{prepped.url}'"
-        table.add_row("curl", curl_command)
+    table = Table()
+    table.add_column("Label editor url", style="bold")
+    table.add_column("Status code")
+    table.add_column("Elapsed time")
+    table.add_column("Response")
+    for url, (status, text, elapsed) in zip(urls, results):
+        table.add_row(url, status, f"{elapsed:.4f}s", text)
 
-        rich.print(table)
+    rich.print(table)
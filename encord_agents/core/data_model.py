@@ -79,6 +79,7 @@ class Frame:
         self,
         image_format: Base64Formats = ".jpeg",
         output_format: Literal["raw", "url"] = "raw",
+        max_size: int | None = None,
     ) -> str: ...
 
     @overload
@@ -86,12 +87,14 @@ class Frame:
         self,
         image_format: Literal[".jpeg", ".jpg", ".png"] = ".jpeg",
         output_format: Literal["openai", "anthropic"] = "openai",
+        max_size: int | None = None,
     ) -> dict[str, str | dict[str, str]]: ...
 
     def b64_encoding(
         self,
         image_format: Literal[".jpeg", ".jpg", ".png"] = ".jpeg",
         output_format: Literal["url", "openai", "anthropic", "raw"] = "url",
+        max_size: int | None = None,
     ) -> str | dict[str, str | dict[str, str]]:
         """
         Get a base64 representation of the image content.
@@ -110,11 +113,14 @@ class Frame:
                 - `url`: url encoded image content. Compatible with, e.g., `<img src="<the_encoding>" />`
                 - `openai`: a dict with `type` and `image_url` keys
                 _ `anthropic`: a dict with `media_type`, `type`, and `data` keys.
+            max_size: If set, the image is downscaled (keeping the aspect ratio) such that
+                its longest side is at most `max_size` pixels before it is encoded.
+                Smaller images mean fewer bytes on the wire and fewer image tokens for LLMs.
 
         Returns: a dict or string depending on `output_format`.
 
         """
-        b64_str = b64_encode_image(self.content, image_format)
+        b64_str = b64_encode_image(self.content, image_format, max_size=max_size)
         if output_format == "raw":
             return b64_str
 
@@ -1,5 +1,6 @@
 import json
 from enum import Enum
+from functools import cached_property
 from typing import Any, ClassVar, Generic, Literal, TypeVar, Union, cast, overload
 
 from encord.objects.attributes import (
@@ -376,8 +377,9 @@ class OntologyDataModel(Generic[OntologyType]):
     def model_json_schema(self) -> dict[str, Any]:
         return self.DataModel.model_json_schema()
 
-    @property
+    @cached_property
     def model_json_schema_str(self) -> str:
+        # The data model is fixed at construction, so the schema only needs to be serialized once.
         return json.dumps(self.model_json_schema)
 
     @overload
@@ -5,6 +5,7 @@ Note that central settings will be read via environment variables.
 """
 
 import os
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -77,10 +78,23 @@ class Settings(BaseSettings):
 
         return self
 
-    @property
+    @cached_property
     def ssh_key(self) -> str:
-        if self.ssh_key_content is None:
-            if self.ssh_key_file is None:
-                raise ValueError("Both ssh key content and ssh key file is None")
-            self.ssh_key_content = self.ssh_key_file.read_text()
-        return self.ssh_key_content
+        if self.ssh_key_content is not None:
+            return self.ssh_key_content
+        if self.ssh_key_file is None:
+            raise ValueError("Both ssh key content and ssh key file is None")
+        return self.ssh_key_file.read_text()
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the settings of the current process.
+
+    The environment is read and validated on the first call only.
+
+    Returns:
+        The (shared) settings.
+    """
+    return Settings()
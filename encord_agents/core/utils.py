@@ -1,20 +1,26 @@
-import mimetypes
+import time
+from collections import defaultdict
 from contextlib import contextmanager
 from functools import lru_cache
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from tempfile import TemporaryDirectory
-from typing import Any, Generator, cast
+from typing import Any, Generator, Sequence, cast
+from urllib.parse import urlparse
+from uuid import UUID
 
 import cv2
+import numpy as np
 import requests
 from encord.constants.enums import DataType
 from encord.objects.ontology_labels_impl import LabelRowV2
+from encord.project import Project
 from encord.user_client import EncordUserClient
+from numpy.typing import NDArray
 
 from encord_agents.core.data_model import FrameData, LabelRowInitialiseLabelsArgs, LabelRowMetadataIncludeArgs
-from encord_agents.core.settings import Settings
+from encord_agents.core.settings import get_settings
 
-from .video import get_frame
+from .video import get_frame, get_frames
 
 
 @lru_cache(maxsize=1)
@@ -26,11 +32,48 @@ def get_user_client() -> EncordUserClient:
         An EncordUserClient authenticated with the credentials from the encord_agents.core.settings.Settings.
 
     """
-    settings = Settings()
+    settings = get_settings()
     kwargs: dict[str, Any] = {"domain": settings.domain} if settings.domain else {}
     return EncordUserClient.create_with_ssh_private_key(ssh_private_key=settings.ssh_key, **kwargs)
 
 
+# Projects are refetched after this many seconds, such that changes to them (e.g., to the ontology) are picked up
+PROJECT_CACHE_TTL_SECONDS = 300
+
+
+@lru_cache(maxsize=32)
+def _get_project(client: EncordUserClient, project_hash: str, ttl_bucket: int) -> Project:
+    # `ttl_bucket` changes every `PROJECT_CACHE_TTL_SECONDS`, which makes older entries miss
+    return client.get_project(project_hash)
+
+
+def get_project(project_hash: str, client: EncordUserClient | None = None) -> Project:
+    """
+    Get a project by its hash.
+
+    Projects are cached per client and project hash for up to `PROJECT_CACHE_TTL_SECONDS`,
+    such that repeated requests against the same project do not fetch it from Encord again.
+    Use `clear_project_cache` to pick up changes to a project (e.g., to its ontology) right away.
+
+    Args:
+        project_hash: The hash of the project.
+        client: The client to fetch the project with. Defaults to `get_user_client()`.
+
+    Returns:
+        The project.
+
+    """
+    ttl_bucket = int(time.monotonic() // PROJECT_CACHE_TTL_SECONDS)
+    return _get_project(client or get_user_client(), project_hash, ttl_bucket)
+
+
+def clear_project_cache() -> None:
+    """
+    Drop all cached projects, such that `get_project` fetches them from Encord again.
+    """
+    _get_project.cache_clear()
+
+
 def get_initialised_label_row(
     frame_data: FrameData,
     include_args: LabelRowMetadataIncludeArgs | None = None,
@@ -49,8 +92,7 @@ def get_initialised_label_row(
         The initialized label row.
 
     """
-    user_client = get_user_client()
-    project = user_client.get_project(str(frame_data.project_hash))
+    project = get_project(str(frame_data.project_hash))
     include_args = include_args or LabelRowMetadataIncludeArgs()
     init_args = init_args or LabelRowInitialiseLabelsArgs()
     matched_lrs = project.list_label_rows_v2(data_hashes=[frame_data.data_hash], **include_args.model_dump())
@@ -64,6 +106,94 @@ def get_initialised_label_row(
     return lr
 
 
+def get_initialised_label_rows(
+    frame_data: list[FrameData],
+    include_args: LabelRowMetadataIncludeArgs | None = None,
+    init_args: LabelRowInitialiseLabelsArgs | None = None,
+) -> list[LabelRowV2]:
+    """
+    Get initialised label rows for many frame data objects at once.
+
+    Label rows are listed with one request per project and their labels are
+    initialised in a bundle, which is considerably faster than calling
+    `get_initialised_label_row` once per frame data object.
+
+    Args:
+        frame_data: The data pointing to the data assets.
+
+    Raises:
+        Exception: If any of the `frame_data` cannot be matched to a label row
+
+    Returns:
+        The initialized label rows in the same order as `frame_data`.
+        Frame data objects pointing to the same data unit share the same label row.
+
+    """
+    include_args = include_args or LabelRowMetadataIncludeArgs()
+    init_args = init_args or LabelRowInitialiseLabelsArgs()
+
+    data_hashes_by_project: dict[UUID, set[UUID]] = defaultdict(set)
+    for fd in frame_data:
+        data_hashes_by_project[fd.project_hash].add(fd.data_hash)
+
+    label_rows: dict[tuple[UUID, UUID], LabelRowV2] = {}
+    for project_hash, data_hashes in data_hashes_by_project.items():
+        project = get_project(str(project_hash))
+        matched_lrs = project.list_label_rows_v2(data_hashes=list(data_hashes), **include_args.model_dump())
+        for lr in matched_lrs:
+            key = (project_hash, UUID(lr.data_hash))
+            if key in label_rows:
+                raise Exception(f"Non unique match: matched multiple label rows for data hash `{lr.data_hash}`!")
+            label_rows[key] = lr
+
+        with project.create_bundle() as bundle:
+            for lr in matched_lrs:
+                lr.initialise_labels(bundle=bundle, **init_args.model_dump())
+
+    unmatched = [str(fd.data_hash) for fd in frame_data if (fd.project_hash, fd.data_hash) not in label_rows]
+    if unmatched:
+        raise Exception(f"No label rows were matched for data hashes: {unmatched}")
+    return [label_rows[(fd.project_hash, fd.data_hash)] for fd in frame_data]
+
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Decoding flags by the factor that the width and height of an image are reduced with
+_REDUCED_IMREAD_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+# Newer OpenCV versions (>= 4.10) can decode straight to RGB, which saves the channel swap afterwards
+_IMREAD_COLOR_RGB: int | None = getattr(cv2, "IMREAD_COLOR_RGB", None)
+
+# Suffixes of the file types that Encord supports. Unknown suffixes fall through to the next guess.
+_SUFFIX_FILE_TYPES: dict[str, str] = {
+    ".jpg": "image",
+    ".jpeg": "image",
+    ".png": "image",
+    ".webp": "image",
+    ".bmp": "image",
+    ".gif": "image",
+    ".tif": "image",
+    ".tiff": "image",
+    ".mp4": "video",
+    ".m4v": "video",
+    ".mov": "video",
+    ".webm": "video",
+    ".avi": "video",
+    ".mkv": "video",
+    ".mp3": "audio",
+    ".wav": "audio",
+    ".flac": "audio",
+    ".aac": "audio",
+    ".m4a": "audio",
+    ".ogg": "audio",
+}
+
+
 def _guess_file_suffix(url: str, lr: LabelRowV2) -> tuple[str, str]:
     """
     Best effort attempt to guess file suffix given a url and label row.
@@ -82,36 +212,95 @@ def _guess_file_suffix(url: str, lr: LabelRowV2) -> tuple[str, str]:
         A file type and suffix that can be used to store the file.
         For example, ("image", ".jpg") or ("video", ".mp4").
     """
-    fallback_mimetype = "video/mp4" if lr.data_type == DataType.VIDEO else "image/png"
-    mimetype, _ = next(
+    suffix = next(
         (
-            t
-            for t in (
-                mimetypes.guess_type(url),
-                mimetypes.guess_type(lr.data_title),
-                (fallback_mimetype, None),
+            sfx
+            for sfx in (
+                PurePosixPath(urlparse(url).path).suffix.lower(),
+                PurePosixPath(lr.data_title).suffix.lower(),
             )
-            if t[0] is not None
-        )
+            if sfx in _SUFFIX_FILE_TYPES
+        ),
+        ".mp4" if lr.data_type == DataType.VIDEO else ".png",
     )
-    if mimetype is None:
-        raise ValueError("This should not have happened")
-
-    file_type, suffix = mimetype.split("/")[:2]
+    file_type = _SUFFIX_FILE_TYPES[suffix]
 
     if (file_type == "audio" and lr.data_type != DataType.AUDIO) or (
         file_type == "video" and lr.data_type != DataType.VIDEO
     ):
-        raise ValueError(f"Mimetype {mimetype} and lr data type {lr.data_type} did not match")
+        raise ValueError(f"File type {file_type} and lr data type {lr.data_type} did not match")
     elif file_type == "image" and lr.data_type not in {
         DataType.IMG_GROUP,
         DataType.IMAGE,
     }:
-        raise ValueError(f"Mimetype {mimetype} and lr data type {lr.data_type} did not match")
-    elif file_type not in {"image", "video", "audio"}:
-        raise ValueError("File type not audio, video, or image")
+        raise ValueError(f"File type {file_type} and lr data type {lr.data_type} did not match")
+
+    return file_type, suffix
+
+
+def _download_to_file(url: str, file_path: Path) -> None:
+    # Stream the body to disk such that large videos are never held in memory as a whole.
+    with requests.get(url, stream=True) as response:
+        response.raise_for_status()
+        with open(file_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+
+
+def _download_bytes(url: str) -> bytes:
+    response = requests.get(url)
+    response.raise_for_status()
+    return response.content
+
+
+def _get_data_url(lr: LabelRowV2) -> str | None:
+    """
+    Resolve a (signed) url from which the whole asset of a label row can be downloaded.
+
+    Returns:
+        The url or `None` for native image groups, which only have a url per image.
+    """
+    if lr.data_link is not None and lr.data_link[:5] == "https":
+        return lr.data_link
+    elif lr.backing_item_uuid is not None:
+        storage_item = get_user_client().get_storage_item(lr.backing_item_uuid, sign_url=True)
+        return storage_item.get_signed_url()
+    return None
+
+
+def _get_image_urls(lr: LabelRowV2) -> list[str | None]:
+    """
+    Resolve the signed urls of the images of a native image group, in frame order.
+    """
+    _, images_list = lr._project_client.get_data(lr.data_hash, get_signed_url=True)
+    if images_list is None:
+        raise ValueError("Image list should not be none for image groups.")
+    return [cast(str | None, image.file_link) for image in images_list]
+
 
-    return file_type, f".{suffix}"
+def _get_asset_url(lr: LabelRowV2, frame: int | None) -> tuple[str, bool]:
+    """
+    Resolve a (signed) url from which the asset of a label row can be downloaded.
+
+    Returns:
+        The url and whether it points to an image sequence (which is stored as a video).
+    """
+    url = _get_data_url(lr)
+
+    # Fallback for native image groups (they don't have a url)
+    is_image_sequence = lr.data_type == DataType.IMG_GROUP
+    if url is None:
+        is_image_sequence = False
+        image_urls = _get_image_urls(lr)
+        if frame is None:
+            raise NotImplementedError(
+                "Downloading entire image group is not supported. Please contact Encord at support@encord.com for help or submit a PR with an implementation."
+            )
+        url = image_urls[frame]
+
+    if url is None:
+        raise ValueError("Failed to get a signed url for the asset")
+    return url, is_image_sequence
 
 
 @contextmanager
@@ -142,47 +331,121 @@ def download_asset(lr: LabelRowV2, frame: int | None = None) -> Generator[Path,
         The file path for the requested asset.
 
     """
-    url: str | None = None
-    if lr.data_link is not None and lr.data_link[:5] == "https":
-        url = lr.data_link
-    elif lr.backing_item_uuid is not None:
-        storage_item = get_user_client().get_storage_item(lr.backing_item_uuid, sign_url=True)
-        url = storage_item.get_signed_url()
-
-    # Fallback for native image groups (they don't have a url)
-    is_image_sequence = lr.data_type == DataType.IMG_GROUP
-    if url is None:
-        is_image_sequence = False
-        _, images_list = lr._project_client.get_data(lr.data_hash, get_signed_url=True)
-        if images_list is None:
-            raise ValueError("Image list should not be none for image groups.")
-        if frame is None:
-            raise NotImplementedError(
-                "Downloading entire image group is not supported. Please contact Encord at support@encord.com for help or submit a PR with an implementation."
-            )
-        image = images_list[frame]
-        url = cast(str | None, image.file_link)
-
-    if url is None:
-        raise ValueError("Failed to get a signed url for the asset")
-
-    response = requests.get(url)
-    response.raise_for_status()
+    url, is_image_sequence = _get_asset_url(lr, frame)
 
     with TemporaryDirectory() as dir_name:
         dir_path = Path(dir_name)
 
         _, suffix = _guess_file_suffix(url, lr)
         file_path = dir_path / f"{lr.data_hash}{suffix}"
-        with open(file_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=4096):
-                if chunk:
-                    f.write(chunk)
+        _download_to_file(url, file_path)
 
         if (lr.data_type == DataType.VIDEO or is_image_sequence) and frame is not None:  # Get that exact frame
             frame_content = get_frame(file_path, frame)
             frame_file = file_path.with_name(f"{file_path.name}_{frame}").with_suffix(".png")
-            cv2.imwrite(frame_file.as_posix(), frame_content)
+            # `get_frame` yields RGB while `imwrite` expects BGR
+            cv2.imwrite(frame_file.as_posix(), cv2.cvtColor(frame_content, cv2.COLOR_RGB2BGR, dst=frame_content))
             file_path = frame_file
 
         yield file_path
+
+
+def download_frame(lr: LabelRowV2, frame: int, reduce_factor: int = 1) -> NDArray[np.uint8]:
+    """
+    Download and decode a single frame of the asset associated to a label row.
+
+    Images are decoded straight from memory. Videos and image sequences are
+    downloaded to a temporary file, from which only the requested frame is read.
+    In neither case is the frame written back to disk.
+
+    Args:
+        lr: The label row for which you want the frame.
+        frame: The frame that you need.
+        reduce_factor: Reduce both the width and height of the frame by this factor.
+            One of 1, 2, 4, or 8. Images are downscaled while they are being decoded,
+            which is cheaper than decoding them in full resolution. Video frames are
+            decoded in full resolution and resized afterwards.
+
+    Raises:
+        ValueError: If the `reduce_factor` is not supported or if you try to
+            download an unsupported data type (e.g., DICOM).
+
+    Returns:
+        Numpy array of shape [h, w, 3] RGB colors.
+
+    """
+    if reduce_factor not in _REDUCED_IMREAD_FLAGS:
+        raise ValueError(f"`reduce_factor` must be one of {list(_REDUCED_IMREAD_FLAGS)}. Got {reduce_factor}")
+
+    url, is_image_sequence = _get_asset_url(lr, frame)
+    _, suffix = _guess_file_suffix(url, lr)
+
+    if lr.data_type == DataType.VIDEO or is_image_sequence:
+        with TemporaryDirectory() as dir_name:
+            file_path = Path(dir_name) / f"{lr.data_hash}{suffix}"
+            _download_to_file(url, file_path)
+            rgb = get_frame(file_path, frame)
+        if reduce_factor == 1:
+            return rgb
+        height, width = rgb.shape[:2]
+        size = (max(1, width // reduce_factor), max(1, height // reduce_factor))
+        return cast(NDArray[np.uint8], cv2.resize(rgb, size, interpolation=cv2.INTER_AREA))
+
+    return _decode_image(_download_bytes(url), reduce_factor)
+
+
+def _decode_image(data: bytes, reduce_factor: int = 1) -> NDArray[np.uint8]:
+    buf = np.frombuffer(data, dtype=np.uint8)
+    flags = _REDUCED_IMREAD_FLAGS[reduce_factor]
+    if _IMREAD_COLOR_RGB is not None:
+        return cast(NDArray[np.uint8], cv2.imdecode(buf, (flags & ~cv2.IMREAD_COLOR) | _IMREAD_COLOR_RGB))
+    img = cast(NDArray[np.uint8], cv2.imdecode(buf, flags))
+    # Decoding already yields uint8, so convert in place instead of allocating another image
+    return cast(NDArray[np.uint8], cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=img))
+
+
+def download_frames(lr: LabelRowV2, frames: Sequence[int]) -> dict[int, NDArray[np.uint8]]:
+    """
+    Download and decode multiple frames of the asset associated to a label row.
+
+    Videos and image sequences are downloaded once and all the frames are decoded
+    in a single pass. The images of native image groups are downloaded and decoded
+    one by one, but their urls are resolved only once.
+
+    Args:
+        lr: The label row for which you want the frames.
+        frames: The frames that you need.
+
+    Raises:
+        ValueError: If you try to download an unsupported data type (e.g., DICOM).
+        Exception: If any of the frames could not be read from the video.
+
+    Returns:
+        A dictionary from frame number to numpy arrays of shape [h, w, 3] RGB colors.
+
+    """
+    desired_frames = sorted(set(frames))
+    if not desired_frames:
+        return {}
+
+    if lr.data_type not in {DataType.VIDEO, DataType.IMG_GROUP}:
+        return {frame: download_frame(lr, frame) for frame in desired_frames}
+
+    url = _get_data_url(lr)
+    if url is None:
+        # Native image group. Resolve the urls of all images at once instead of once per frame.
+        image_urls = _get_image_urls(lr)
+        decoded: dict[int, NDArray[np.uint8]] = {}
+        for frame in desired_frames:
+            image_url = image_urls[frame]
+            if image_url is None:
+                raise ValueError("Failed to get a signed url for the asset")
+            _guess_file_suffix(image_url, lr)  # Validates that the file type matches the data type
+            decoded[frame] = _decode_image(_download_bytes(image_url))
+        return decoded
+
+    _, suffix = _guess_file_suffix(url, lr)
+    with TemporaryDirectory() as dir_name:
+        file_path = Path(dir_name) / f"{lr.data_hash}{suffix}"
+        _download_to_file(url, file_path)
+        return get_frames(file_path, desired_frames)
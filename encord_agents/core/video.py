@@ -1,12 +1,20 @@
+import queue
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterator
+from typing import Generator, Iterable, Iterator, TypeVar, cast
 
 import cv2
 import numpy as np
+from encord.constants.enums import DataType
+from encord.objects.ontology_labels_impl import LabelRowV2
 from numpy.typing import NDArray
 
 from encord_agents.core.data_model import Frame
 
+T = TypeVar("T")
+_END = object()
+
 
 def get_frame(video_path: Path, desired_frame: int) -> NDArray[np.uint8]:
     """
@@ -25,45 +33,215 @@ def get_frame(video_path: Path, desired_frame: int) -> NDArray[np.uint8]:
 
     """
     cap = cv2.VideoCapture(video_path.as_posix())
-    if not cap.isOpened():
-        raise Exception("Error opening video file.")
+    try:
+        if not cap.isOpened():
+            raise Exception("Error opening video file.")
+
+        # A freshly opened capture already points at the first frame. Seeking makes
+        # the backend flush its decoder and go through the nearest key frame again.
+        if desired_frame > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, desired_frame)
+
+        ret, frame = cap.read()
+        if not ret:
+            raise Exception("Error retrieving frame.")
+    finally:
+        cap.release()
+
+    return cast(NDArray[np.uint8], cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame))
+
 
-    cap.set(cv2.CAP_PROP_POS_FRAMES, desired_frame)
+def get_frames(video_path: Path, desired_frames: Iterable[int]) -> dict[int, NDArray[np.uint8]]:
+    """
+    Extract multiple exact frames from a video.
+
+    The video is opened once and read in a single forward pass up to the last
+    desired frame. Frames in between are grabbed but never decoded into images.
+    This is considerably cheaper than calling `get_frame` once per frame.
 
-    ret, frame = cap.read()
-    if not ret:
-        raise Exception("Error retrieving frame.")
+    Args:
+        video_path: The file path to where the video is stored.
+        desired_frames: The frames to extract.
 
-    cap.release()
-    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    return frame.astype(np.uint8)
+    Raises:
+        Exception:  If the video cannot be opened properly or any of the requested
+            frames could not be retrieved from the video.
 
+    Returns:
+        A dictionary from frame number to numpy arrays of shape [h, w, c] where channels are RGB.
 
-def iter_video(video_path: Path) -> Iterator[Frame]:
+    """
+    wanted = set(desired_frames)
+    if not wanted:
+        return {}
+    last_frame = max(wanted)
+
+    frames: dict[int, NDArray[np.uint8]] = {}
+    cap = cv2.VideoCapture(video_path.as_posix())
+    try:
+        if not cap.isOpened():
+            raise Exception("Error opening video file.")
+
+        frame_num = 0
+        while frame_num <= last_frame and cap.grab():
+            if frame_num in wanted:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                frames[frame_num] = cast(NDArray[np.uint8], cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame))
+            frame_num += 1
+    finally:
+        cap.release()
+
+    if len(frames) != len(wanted):
+        missing = sorted(wanted - frames.keys())
+        raise Exception(f"Error retrieving frames {missing}.")
+    return frames
+
+
+def iter_video(video_path: Path, reuse_buffer: bool = False, stride: int = 1) -> Iterator[Frame]:
     """
     Iterate video frame by frame.
 
     Args:
         video_path: The file path to the video you wish to iterate.
+        reuse_buffer: If `True`, all frames are decoded into the same array to avoid
+            allocating a new array per frame. The content of a yielded frame is then
+            overwritten by the next frame, so copy it if you need to keep it around.
+        stride: Only yield every `stride`th frame. Skipped frames are grabbed but never
+            retrieved, so they are not converted to images at all.
 
     Raises:
+        ValueError: If `stride` is not a positive integer.
         Exception: If the video file could not be opened properly.
 
     Yields:
         Frames from the video.
 
     """
+    if stride < 1:
+        raise ValueError(f"`stride` must be a positive integer. Got {stride}")
+
     cap = cv2.VideoCapture(video_path.as_posix())
-    if not cap.isOpened():
-        raise Exception("Error opening video file.")
+    # Release the capture even if it failed to open or the consumer stops iterating early
+    try:
+        if not cap.isOpened():
+            raise Exception("Error opening video file.")
+
+        frame_num = 0
+        frame = None
+        while cap.grab():
+            if frame_num % stride == 0:
+                ret, frame = cap.retrieve(frame if reuse_buffer else None)
+                if not ret:
+                    break
+                # The decoded array is owned by this iterator, so it can be converted in place
+                rgb_frame = cast(NDArray[np.uint8], cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame))
+                yield Frame(frame=frame_num, content=rgb_frame)
+            frame_num += 1
+    finally:
+        cap.release()
+
+
+def prefetch_iter(it: Iterator[T], n: int = 4) -> Generator[T, None, None]:
+    """
+    Consume an iterator on a background thread, keeping up to `n` items ready.
 
-    frame_num = 0
-    ret, frame = cap.read()
-    while ret:
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        yield Frame(frame=frame_num, content=rgb_frame.astype(np.uint8))
+    Useful to decode the next video frames while the current frame is being
+    processed. Note that items must not share memory, so don't combine this
+    with `iter_video(..., reuse_buffer=True)`.
 
-        ret, frame = cap.read()
-        frame_num += 1
+    Example usage:
+
+        for frame in prefetch_iter(iter_video(video_path)):
+            # The next frames are decoded while this runs
+            ...
+
+    Args:
+        it: The iterator to consume.
+        n: The maximum number of items to keep in memory ahead of the consumer.
+
+    Yields:
+        The items of `it` in order. Exceptions raised by `it` are re-raised.
 
-    cap.release()
+    """
+    items: queue.Queue[object] = queue.Queue(maxsize=n)
+    stop = threading.Event()
+    errors: list[BaseException] = []
+
+    def put(item: object) -> bool:
+        # Time out regularly so the producer notices when the consumer is gone
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in it:
+                if not put(item):
+                    break
+        except BaseException as e:  # Surfaced to the consumer below
+            errors.append(e)
+        finally:
+            close = getattr(it, "close", None)
+            if close is not None:
+                close()
+            put(_END)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while (item := items.get()) is not _END:
+            yield cast(T, item)
+        if errors:
+            raise errors[0]
+    finally:
+        stop.set()
+        thread.join()
+
+
+def ensure_video_label_row(lr: LabelRowV2) -> LabelRowV2:
+    """
+    Check that a label row belongs to a video.
+
+    The video iterator dependencies depend on this before they depend on the asset,
+    such that other data types fail before anything is downloaded.
+
+    Args:
+        lr: The label row to check.
+
+    Raises:
+        NotImplementedError: If the label row does not belong to a video.
+
+    Returns:
+        The same label row.
+
+    """
+    if not lr.data_type == DataType.VIDEO:
+        raise NotImplementedError("`dep_video_iterator` only supported for video label rows")
+    return lr
+
+
+@contextmanager
+def prefetched_video_frames(video_path: Path) -> Generator[Iterator[Frame], None, None]:
+    """
+    Iterate the frames of a video while the next frames are decoded in the background.
+
+    Decoding stops when the context is left, so the video can be removed from disk afterwards.
+
+    Args:
+        video_path: The file path to the video you wish to iterate.
+
+    Yields:
+        An iterator over the frames of the video.
+
+    """
+    frames = prefetch_iter(iter_video(video_path))
+    try:
+        yield frames
+    finally:
+        frames.close()
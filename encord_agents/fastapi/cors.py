@@ -9,11 +9,10 @@ import typing
 try:
     from fastapi.middleware.cors import CORSMiddleware
     from starlette.types import ASGIApp
-except ModuleNotFoundError:
-    print(
+except ModuleNotFoundError as e:
+    raise ModuleNotFoundError(
         'To use the `fastapi` dependencies, you must also install fastapi. `python -m pip install "fastapi[standard]"'
-    )
-    exit()
+    ) from e
 
 from encord_agents.core.constants import ENCORD_DOMAIN_REGEX
 
@@ -50,11 +49,11 @@ class EncordCORSMiddleware(CORSMiddleware):  # type: ignore [misc]
     ) -> None:
         super().__init__(
             app,
-            allow_origins,
-            allow_methods,
-            allow_headers,
-            allow_credentials,
-            allow_origin_regex,
-            expose_headers,
-            max_age,
+            allow_origins=allow_origins,
+            allow_methods=allow_methods,
+            allow_headers=allow_headers,
+            allow_credentials=allow_credentials,
+            allow_origin_regex=allow_origin_regex,
+            expose_headers=expose_headers,
+            max_age=max_age,
         )
@@ -22,12 +22,9 @@ def my_agent(
 """
 
 from pathlib import Path
-from typing import Annotated, Callable, Generator, Iterator
+from typing import Annotated, Callable, Generator, Iterator, Literal, Sequence
 
-import cv2
 import numpy as np
-from encord.constants.enums import DataType
-from encord.objects.common import Shape
 from encord.objects.ontology_labels_impl import LabelRowV2
 from encord.objects.ontology_object import Object
 from encord.project import Project
@@ -37,23 +34,28 @@ from numpy.typing import NDArray
 
 from encord_agents.core.data_model import LabelRowInitialiseLabelsArgs, LabelRowMetadataIncludeArgs
 from encord_agents.core.dependencies.shares import DataLookup
-from encord_agents.core.vision import crop_to_object
+from encord_agents.core.vision import CROPPABLE_SHAPES, crop_to_object
 
 try:
     from fastapi import Depends, Form
-except ModuleNotFoundError:
-    print(
+except ModuleNotFoundError as e:
+    raise ModuleNotFoundError(
         'To use the `fastapi` dependencies, you must also install fastapi. `python -m pip install "fastapi[standard]"'
-    )
-    exit()
+    ) from e
 
 from encord_agents.core.data_model import Frame, FrameData, InstanceCrop
 from encord_agents.core.utils import (
     download_asset,
+    download_frame,
+    download_frames,
     get_initialised_label_row,
+    get_project,
     get_user_client,
 )
-from encord_agents.core.video import iter_video
+from encord_agents.core.video import ensure_video_label_row, prefetched_video_frames
+
+# Label row dependencies by their (serialized) arguments
+_label_row_dependencies: dict[tuple[str, str], Callable[[FrameData], LabelRowV2]] = {}
 
 
 def dep_client() -> EncordUserClient:
@@ -117,12 +119,21 @@ def dep_label_row_with_args(
 
     """
 
-    def wrapper(frame_data: FrameData) -> LabelRowV2:
-        return get_initialised_label_row(
-            frame_data, include_args=label_row_metadata_include_args, init_args=label_row_initialise_labels_args
-        )
+    include_args = label_row_metadata_include_args or LabelRowMetadataIncludeArgs()
+    init_args = label_row_initialise_labels_args or LabelRowInitialiseLabelsArgs()
+    # FastAPI caches dependencies per request by identity. Handing out the same function for
+    # the same arguments lets all dependencies of a request share a single label row.
+    if include_args == LabelRowMetadataIncludeArgs() and init_args == LabelRowInitialiseLabelsArgs():
+        return dep_label_row
+
+    key = (include_args.model_dump_json(), init_args.model_dump_json())
+    if key not in _label_row_dependencies:
+
+        def wrapper(frame_data: FrameData) -> LabelRowV2:
+            return get_initialised_label_row(frame_data, include_args=include_args, init_args=init_args)
 
-    return wrapper
+        _label_row_dependencies[key] = wrapper
+    return _label_row_dependencies[key]
 
 
 def dep_label_row(frame_data: FrameData) -> LabelRowV2:
@@ -182,20 +193,62 @@ def dep_single_frame(lr: Annotated[LabelRowV2, Depends(dep_label_row)], frame_da
     Returns: Numpy array of shape [h, w, 3] RGB colors.
 
     """
-    with download_asset(lr, frame_data.frame) as asset:
-        img = cv2.cvtColor(cv2.imread(asset.as_posix()), cv2.COLOR_BGR2RGB)
-    return np.asarray(img, dtype=np.uint8)
+    return download_frame(lr, frame_data.frame)
+
+
+def dep_reduced_single_frame(
+    reduce_factor: Literal[1, 2, 4, 8],
+) -> Callable[[LabelRowV2, FrameData], NDArray[np.uint8]]:
+    """
+    Create a dependency that injects the underlying asset of the frame data at a reduced resolution.
+
+    Images are downscaled while they are being decoded, which is cheaper than decoding
+    them in full resolution and resizing them afterwards. Video frames are decoded in full
+    resolution and resized, so they only save memory downstream. Useful for agents that,
+    e.g., only classify the frame and don't need all the pixels.
+
+    Note that coordinates of labels are relative to the image size, so they apply to the
+    reduced frame as is.
+
+    **Example:**
+
+    ```python
+    from encord_agents.fastapi.depencencies import dep_reduced_single_frame
+    ...
+
+    @app.post("/my-route")
+    def my_route(
+        frame: Annotated[NDArray[np.uint8], Depends(dep_reduced_single_frame(4))]
+    ):
+        assert frame.ndim == 3, "Will work"  # with a quarter of the width and height
+    ```
+
+    Args:
+        reduce_factor: The factor by which both the width and height of the frame are reduced.
+
+    Returns:
+        A FastAPI dependency function that provides a numpy array of shape [h, w, 3] RGB colors.
+    """
+    if reduce_factor not in (1, 2, 4, 8):
+        raise ValueError(f"`reduce_factor` must be one of [1, 2, 4, 8]. Got {reduce_factor}")
+
+    def _dep_reduced_single_frame(
+        lr: Annotated[LabelRowV2, Depends(dep_label_row)], frame_data: FrameData
+    ) -> NDArray[np.uint8]:
+        return download_frame(lr, frame_data.frame, reduce_factor=reduce_factor)
+
+    return _dep_reduced_single_frame
+
+
+# Downloads need a signed url for assets in private cloud storage. `dep_label_row_with_args` is memoised,
+# so all dependencies that download the asset share this label row.
+_dep_label_row_with_signed_url = dep_label_row_with_args(
+    label_row_initialise_labels_args=LabelRowInitialiseLabelsArgs(include_signed_url=True)
+)
 
 
 def dep_asset(
-    lr: Annotated[
-        LabelRowV2,
-        Depends(
-            dep_label_row_with_args(
-                label_row_initialise_labels_args=LabelRowInitialiseLabelsArgs(include_signed_url=True)
-            )
-        ),
-    ],
+    lr: Annotated[LabelRowV2, Depends(_dep_label_row_with_signed_url)],
 ) -> Generator[Path, None, None]:
     """
     Get a local file path to data asset temporarily stored till end of agent execution.
@@ -230,7 +283,14 @@ def dep_asset(
         yield asset
 
 
-def dep_video_iterator(lr: Annotated[LabelRowV2, Depends(dep_label_row)]) -> Generator[Iterator[Frame], None, None]:
+def _dep_video_label_row(lr: Annotated[LabelRowV2, Depends(_dep_label_row_with_signed_url)]) -> LabelRowV2:
+    return ensure_video_label_row(lr)
+
+
+def dep_video_iterator(
+    lr: Annotated[LabelRowV2, Depends(_dep_video_label_row)],
+    asset: Annotated[Path, Depends(dep_asset)],
+) -> Generator[Iterator[Frame], None, None]:
     """
     Dependency to inject a video frame iterator for doing things over many frames.
 
@@ -249,7 +309,9 @@ def dep_video_iterator(lr: Annotated[LabelRowV2, Depends(dep_label_row)]) -> Gen
     ```
 
     Args:
-        lr: Automatically injected label row dependency.
+        lr: Automatically injected label row dependency. Checked to be a video before the asset is downloaded.
+        asset: Automatically injected asset dependency. Shared with `dep_asset`,
+            such that the video is only downloaded once per call.
 
     Raises:
         NotImplementedError: Will fail for other data types than video.
@@ -258,10 +320,47 @@ def dep_video_iterator(lr: Annotated[LabelRowV2, Depends(dep_label_row)]) -> Gen
         An iterator.
 
     """
-    if not lr.data_type == DataType.VIDEO:
-        raise NotImplementedError("`dep_video_iterator` only supported for video label rows")
-    with download_asset(lr, None) as asset:
-        yield iter_video(asset)
+    with prefetched_video_frames(asset) as frames:
+        yield frames
+
+
+def dep_frames(frames: Sequence[int]) -> Callable[[LabelRowV2], dict[int, NDArray[np.uint8]]]:
+    """
+    Create a dependency that provides multiple frames of the underlying asset at once.
+
+    For videos and image sequences, the asset is downloaded once and all requested
+    frames are decoded in a single pass over the video, which is much cheaper than
+    fetching the frames one by one.
+
+    **Example:**
+
+    ```python
+    from encord_agents.fastapi.depencencies import dep_frames
+    ...
+
+    @app.post("/my-route")
+    def my_route(
+        frames: Annotated[dict[int, NDArray[np.uint8]], Depends(dep_frames([0, 10, 20]))]
+    ):
+        for frame_number, content in frames.items():
+            print(frame_number, content.shape)
+    ```
+
+    Args:
+        frames: The frame numbers to provide.
+
+    Returns:
+        A FastAPI dependency function that provides a dictionary from frame number
+        to numpy arrays of shape [h, w, 3] RGB colors.
+    """
+    desired_frames = sorted(set(frames))
+
+    def _dep_frames(
+        lr: Annotated[LabelRowV2, Depends(_dep_label_row_with_signed_url)],
+    ) -> dict[int, NDArray[np.uint8]]:
+        return download_frames(lr, desired_frames)
+
+    return _dep_frames
 
 
 def dep_project(frame_data: FrameData, client: Annotated[EncordUserClient, Depends(dep_client)]) -> Project:
@@ -284,21 +383,26 @@ def dep_project(frame_data: FrameData, client: Annotated[EncordUserClient, Depen
     ```
 
 
+    Projects are cached per project hash for a few minutes (see `encord_agents.core.utils.get_project`),
+    so repeated requests against the same project don't fetch it from Encord again.
+
     Args:
-        frame_data:
-        client:
+        frame_data: the frame data from the route. This parameter is automatically injected
+            if it's a part of your route (see example above).
+        client: The authenticated user client.
 
     Returns:
+        The project that the frame data belongs to.
 
     """
-    return client.get_project(project_hash=frame_data.project_hash)
+    return get_project(str(frame_data.project_hash), client=client)
 
 
 def _lookup_adapter(project: Annotated[Project, Depends(dep_project)]) -> DataLookup:
     return DataLookup.sharable(project)
 
 
-def dep_data_lookup(lookup: Annotated[DataLookup, Depends(_lookup_adapter)]) -> DataLookup:
+async def dep_data_lookup(lookup: Annotated[DataLookup, Depends(_lookup_adapter)]) -> DataLookup:
     """
     Get a lookup to easily retrieve data rows and storage items associated with the given task.
 
@@ -407,16 +511,15 @@ def dep_object_crops(
     Returns:
         A FastAPI dependency function that yields a list of InstanceCrop.
     """
-    legal_feature_hashes = {
+    legal_feature_hashes = frozenset(
         o.feature_node_hash if isinstance(o, Object) else o for o in (filter_ontology_objects or [])
-    }
+    )
 
     def _dep_object_crops(
         frame_data: FrameData,
         lr: Annotated[LabelRowV2, Depends(dep_label_row)],
         frame: Annotated[NDArray[np.uint8], Depends(dep_single_frame)],
     ) -> list[InstanceCrop]:
-        legal_shapes = {Shape.POLYGON, Shape.BOUNDING_BOX, Shape.ROTATABLE_BOUNDING_BOX, Shape.BITMASK}
         return [
             InstanceCrop(
                 frame=frame_data.frame,
@@ -424,8 +527,8 @@ def dep_object_crops(
                 instance=o,
             )
             for o in lr.get_object_instances(filter_frames=frame_data.frame)
-            if o.ontology_item.shape in legal_shapes
-            and (not legal_feature_hashes or o.feature_hash in legal_feature_hashes)
+            if (not legal_feature_hashes or o.feature_hash in legal_feature_hashes)
+            and o.ontology_item.shape in CROPPABLE_SHAPES
         ]
 
     return _dep_object_crops
@@ -1,6 +1,6 @@
-import os
+import sys
 
-from encord_agents.core.settings import Settings
+from encord_agents.core.settings import get_settings
 from encord_agents.core.utils import get_user_client
 from encord_agents.exceptions import PrintableError
 
@@ -22,15 +22,15 @@ def verify_auth() -> None:
     """
     from datetime import datetime, timedelta
 
-    Settings()
+    get_settings()
 
     try:
         client = get_user_client()
         client.get_projects(created_after=datetime.now() - timedelta(days=1))
-    except Exception:
+    except Exception as e:
         import traceback
 
-        stack = traceback.format_exc()
+        traceback.print_exc(file=sys.stderr)
         raise PrintableError(
-            f"[red]Was able to read the SSH key, but couldn't list projects with Encord.[/red]. Original error was:{os.linesep}{stack}"
-        )
+            "[red]Was able to read the SSH key, but couldn't list projects with Encord.[/red] See the original error above."
+        ) from e
@@ -30,10 +30,7 @@ def my_agent(
 from pathlib import Path
 from typing import Callable, Generator, Iterator
 
-import cv2
 import numpy as np
-from encord.constants.enums import DataType
-from encord.objects.common import Shape
 from encord.objects.ontology_labels_impl import LabelRowV2
 from encord.objects.ontology_object import Object
 from encord.storage import StorageItem
@@ -44,9 +41,9 @@ from typing_extensions import Annotated
 from encord_agents.core.data_model import Frame, FrameData, InstanceCrop
 from encord_agents.core.dependencies.models import Depends
 from encord_agents.core.dependencies.shares import DataLookup
-from encord_agents.core.utils import download_asset, get_user_client
-from encord_agents.core.video import iter_video
-from encord_agents.core.vision import crop_to_object
+from encord_agents.core.utils import download_asset, download_frame, get_user_client
+from encord_agents.core.video import ensure_video_label_row, prefetched_video_frames
+from encord_agents.core.vision import CROPPABLE_SHAPES, crop_to_object
 
 
 def dep_client() -> EncordUserClient:
@@ -101,10 +98,7 @@ def dep_single_frame(lr: LabelRowV2) -> NDArray[np.uint8]:
         Numpy array of shape [h, w, 3] RGB colors.
 
     """
-    with download_asset(lr, frame=0) as asset:
-        img = cv2.cvtColor(cv2.imread(asset.as_posix()), cv2.COLOR_BGR2RGB)
-
-    return np.asarray(img, dtype=np.uint8)
+    return download_frame(lr, frame=0)
 
 
 def dep_asset(lr: LabelRowV2) -> Generator[Path, None, None]:
@@ -115,6 +109,10 @@ def dep_asset(lr: LabelRowV2) -> Generator[Path, None, None]:
     It will temporarily store the data on disk. Once the task is completed, the
     asset will be removed from disk again.
 
+    The asset is downloaded with the label row that the agent was called with. For assets in
+    private cloud storage, pass `label_row_initialise_labels_args=LabelRowInitialiseLabelsArgs(include_signed_url=True)`
+    to `@editor_agent(...)`, such that the label row holds a signed url.
+
     **Example:**
 
     ```python
@@ -142,7 +140,9 @@ def dep_asset(lr: LabelRowV2) -> Generator[Path, None, None]:
         yield asset
 
 
-def dep_video_iterator(lr: LabelRowV2) -> Generator[Iterator[Frame], None, None]:
+def dep_video_iterator(
+    lr: Annotated[LabelRowV2, Depends(ensure_video_label_row)], asset: Annotated[Path, Depends(dep_asset)]
+) -> Generator[Iterator[Frame], None, None]:
     """
     Dependency to inject a video frame iterator for doing things over many frames.
 
@@ -163,7 +163,9 @@ def dep_video_iterator(lr: LabelRowV2) -> Generator[Iterator[Frame], None, None]
     ```
 
     Args:
-        lr: Automatically injected label row dependency.
+        lr: Automatically injected label row dependency. Checked to be a video before the asset is downloaded.
+        asset: Automatically injected asset dependency. Shared with `dep_asset`,
+            such that the video is only downloaded once per call.
 
     Raises:
         NotImplementedError: Will fail for other data types than video.
@@ -172,11 +174,8 @@ def dep_video_iterator(lr: LabelRowV2) -> Generator[Iterator[Frame], None, None]
         An iterator.
 
     """
-    if not lr.data_type == DataType.VIDEO:
-        raise NotImplementedError("`dep_video_iterator` only supported for video label rows")
-
-    with download_asset(lr, None) as asset:
-        yield iter_video(asset)
+    with prefetched_video_frames(asset) as frames:
+        yield frames
 
 
 def dep_data_lookup(lookup: Annotated[DataLookup, Depends(DataLookup.sharable)]) -> DataLookup:
@@ -288,14 +287,13 @@ def dep_object_crops(
     Returns: The dependency to be injected into the cloud function.
 
     """
-    legal_feature_hashes = {
+    legal_feature_hashes = frozenset(
         o.feature_node_hash if isinstance(o, Object) else o for o in (filter_ontology_objects or [])
-    }
+    )
 
     def _dep_object_crops(
         frame_data: FrameData, lr: LabelRowV2, frame: Annotated[NDArray[np.uint8], Depends(dep_single_frame)]
     ) -> list[InstanceCrop]:
-        legal_shapes = {Shape.POLYGON, Shape.BOUNDING_BOX, Shape.ROTATABLE_BOUNDING_BOX, Shape.BITMASK}
         return [
             InstanceCrop(
                 frame=frame_data.frame,
@@ -303,8 +301,8 @@ def dep_object_crops(
                 instance=o,
             )
             for o in lr.get_object_instances(filter_frames=frame_data.frame)
-            if o.ontology_item.shape in legal_shapes
-            and (not legal_feature_hashes or o.feature_hash in legal_feature_hashes)
+            if (not legal_feature_hashes or o.feature_hash in legal_feature_hashes)
+            and o.ontology_item.shape in CROPPABLE_SHAPES
         ]
 
     return _dep_object_crops
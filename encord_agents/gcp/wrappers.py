@@ -1,31 +1,44 @@
 import logging
 import re
 from contextlib import ExitStack
-from functools import wraps
+from functools import lru_cache, wraps
 from typing import Any, Callable
 
-import orjson
 from encord.objects.ontology_labels_impl import LabelRowV2
-from flask import Request, Response, make_response
+from flask import Request, Response
 
 from encord_agents import FrameData
 from encord_agents.core.constants import ENCORD_DOMAIN_REGEX
 from encord_agents.core.data_model import LabelRowInitialiseLabelsArgs, LabelRowMetadataIncludeArgs
 from encord_agents.core.dependencies.models import Context
 from encord_agents.core.dependencies.utils import get_dependant, solve_dependencies
-from encord_agents.core.utils import get_user_client
+from encord_agents.core.utils import get_project
 
 AgentFunction = Callable[..., Any]
 
+_CORS_REGEX = re.compile(ENCORD_DOMAIN_REGEX)
+_RESPONSE_HEADERS = {"Access-Control-Allow-Origin": "*"}
+_VARY_HEADERS = {"Vary": "Origin"}
+
+
+@lru_cache(maxsize=64)
+def _preflight_headers(origin: str) -> dict[str, str]:
+    # Only a handful of Encord origins pass the CORS check, so the headers are built once per origin
+    return {
+        **_VARY_HEADERS,
+        "Access-Control-Allow-Origin": origin,
+        "Access-Control-Allow-Methods": "POST",
+        "Access-Control-Allow-Headers": "Content-Type",
+        "Access-Control-Max-Age": "3600",
+    }
+
 
 def generate_response() -> Response:
     """
     Generate a Response object with status 200 in order to tell the FE that the function has finished successfully.
     :return: Response object with the right CORS settings.
     """
-    response = make_response("")
-    response.headers["Access-Control-Allow-Origin"] = "*"
-    return response
+    return Response("", headers=_RESPONSE_HEADERS)
 
 
 def editor_agent(
@@ -51,27 +64,13 @@ def editor_agent(
 
     def context_wrapper_inner(func: AgentFunction) -> Callable[[Request], Response]:
         dependant = get_dependant(func=func)
-        cors_regex = re.compile(ENCORD_DOMAIN_REGEX)
 
         @wraps(func)
         def wrapper(request: Request) -> Response:
             if request.method == "OPTIONS":
-                response = make_response("")
-                response.headers["Vary"] = "Origin"
-
-                if not cors_regex.fullmatch(request.origin):
-                    response.status_code = 403
-                    return response
-
-                headers = {
-                    "Access-Control-Allow-Origin": request.origin,
-                    "Access-Control-Allow-Methods": "POST",
-                    "Access-Control-Allow-Headers": "Content-Type",
-                    "Access-Control-Max-Age": "3600",
-                }
-                response.headers.update(headers)
-                response.status_code = 204
-                return response
+                if not _CORS_REGEX.fullmatch(request.origin):
+                    return Response("", status=403, headers=_VARY_HEADERS)
+                return Response("", status=204, headers=_preflight_headers(request.origin))
 
             # TODO: We'll remove FF from FE on Jan. 31 2025.
             #   At that point, only the if statement applies and the else should be removed.
@@ -81,8 +80,7 @@ def editor_agent(
                 frame_data = FrameData.model_validate_json(request.get_data())
             logging.info(f"Request: {frame_data}")
 
-            client = get_user_client()
-            project = client.get_project(str(frame_data.project_hash))
+            project = get_project(str(frame_data.project_hash))
 
             label_row: LabelRowV2 | None = None
             if dependant.needs_label_row:
@@ -2,9 +2,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Generator, Iterator
 
-import cv2
 import numpy as np
-from encord.constants.enums import DataType
 from encord.exceptions import AuthenticationError, AuthorisationError
 from encord.objects.ontology_labels_impl import LabelRowV2
 from encord.project import Project
@@ -19,8 +17,8 @@ from typing_extensions import Annotated
 from encord_agents.core.data_model import Frame
 from encord_agents.core.dependencies.models import Depends
 from encord_agents.core.dependencies.shares import DataLookup
-from encord_agents.core.utils import download_asset, get_user_client
-from encord_agents.core.video import iter_video
+from encord_agents.core.utils import download_asset, download_frame, get_user_client
+from encord_agents.core.video import ensure_video_label_row, prefetched_video_frames
 from encord_agents.exceptions import PrintableError
 
 
@@ -75,47 +73,7 @@ def dep_single_frame(lr: LabelRowV2) -> NDArray[np.uint8]:
         Numpy array of shape [h, w, 3] RGB colors.
 
     """
-    with download_asset(lr, frame=0) as asset:
-        img = cv2.cvtColor(cv2.imread(asset.as_posix()), cv2.COLOR_BGR2RGB)
-
-    return np.asarray(img, dtype=np.uint8)
-
-
-def dep_video_iterator(lr: LabelRowV2) -> Generator[Iterator[Frame], None, None]:
-    """
-    Dependency to inject a video frame iterator for doing things over many frames.
-
-    **Intended use**
-
-    ```python
-    from encord_agents import FrameData
-    from encord_agents.tasks.depencencies import dep_video_iterator
-    ...
-
-    @runner.stage("<my_stage_name>")
-    def my_agent(
-        lr: LabelRowV2,  # <- Automatically injected
-        video_frames: Annotated[Iterator[Frame], Depends(dep_video_iterator)]
-    ) -> str:
-        for frame in video_frames:
-            print(frame.frame, frame.content.shape)
-    ```
-
-    Args:
-        lr: Automatically injected label row dependency.
-
-    Raises:
-        NotImplementedError: Will fail for other data types than video.
-
-    Yields:
-        An iterator.
-
-    """
-    if not lr.data_type == DataType.VIDEO:
-        raise NotImplementedError("`dep_video_iterator` only supported for video label rows")
-
-    with download_asset(lr, None) as asset:
-        yield iter_video(asset)
+    return download_frame(lr, frame=0)
 
 
 def dep_asset(lr: LabelRowV2) -> Generator[Path, None, None]:
@@ -126,6 +84,10 @@ def dep_asset(lr: LabelRowV2) -> Generator[Path, None, None]:
     It will temporarily store the data on disk. Once the task is completed, the
     asset will be removed from disk again.
 
+    The asset is downloaded with the label row that the agent was called with. For assets in
+    private cloud storage, pass `label_row_initialise_labels_args=LabelRowInitialiseLabelsArgs(include_signed_url=True)`
+    to `@runner.stage(...)`, such that the label row holds a signed url.
+
     **Example:**
 
     ```python
@@ -152,6 +114,44 @@ def dep_asset(lr: LabelRowV2) -> Generator[Path, None, None]:
         yield asset
 
 
+def dep_video_iterator(
+    lr: Annotated[LabelRowV2, Depends(ensure_video_label_row)], asset: Annotated[Path, Depends(dep_asset)]
+) -> Generator[Iterator[Frame], None, None]:
+    """
+    Dependency to inject a video frame iterator for doing things over many frames.
+
+    **Intended use**
+
+    ```python
+    from encord_agents import FrameData
+    from encord_agents.tasks.depencencies import dep_video_iterator
+    ...
+
+    @runner.stage("<my_stage_name>")
+    def my_agent(
+        lr: LabelRowV2,  # <- Automatically injected
+        video_frames: Annotated[Iterator[Frame], Depends(dep_video_iterator)]
+    ) -> str:
+        for frame in video_frames:
+            print(frame.frame, frame.content.shape)
+    ```
+
+    Args:
+        lr: Automatically injected label row dependency. Checked to be a video before the asset is downloaded.
+        asset: Automatically injected asset dependency. Shared with `dep_asset`,
+            such that the video is only downloaded once per call.
+
+    Raises:
+        NotImplementedError: Will fail for other data types than video.
+
+    Yields:
+        An iterator.
+
+    """
+    with prefetched_video_frames(asset) as frames:
+        yield frames
+
+
 @dataclass(frozen=True)
 class Twin:
     """
@@ -1,8 +1,10 @@
 import os
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import ExitStack
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Callable, Iterable, Optional, cast
 from uuid import UUID
 
@@ -299,6 +301,31 @@ class Runner:
                             print(f"[attempt {attempt+1}/{num_retries+1}] Agent failed with error: ")
                             traceback.print_exc()
 
+    @staticmethod
+    def _get_batch_label_rows(
+        project: Project,
+        batch: list[AgentTask],
+        runner_agent: RunnerAgent,
+        include_args: LabelRowMetadataIncludeArgs,
+        init_args: LabelRowInitialiseLabelsArgs,
+    ) -> list[LabelRowV2 | None]:
+        if not runner_agent.dependant.needs_label_row:
+            return [None] * len(batch)
+
+        label_rows = {
+            UUID(lr.data_hash): lr
+            for lr in project.list_label_rows_v2(
+                data_hashes=[t.data_hash for t in batch],
+                **include_args.model_dump(),
+            )
+        }
+        batch_lrs = [label_rows.get(t.data_hash) for t in batch]
+        with project.create_bundle() as lr_bundle:
+            for lr in batch_lrs:
+                if lr:
+                    lr.initialise_labels(bundle=lr_bundle, **init_args.model_dump())
+        return batch_lrs
+
     @staticmethod
     def get_stage_names(valid_stages: list[AgentStage], join_str: str = ", ") -> str:
         return join_str.join(
@@ -337,6 +364,9 @@ class Runner:
                 If `None`, the runner will exit once task queue is empty.
             num_retries: If an agent fails on a task, how many times should the runner retry it?
             task_batch_size: Number of tasks for which labels are loaded into memory at once.
+                The label rows of the next batch are loaded in the background while the agent
+                works through the current batch. Hence, changes that the agent saves to label rows
+                of a later batch while it works on the current batch are not reflected in them.
             project_hash: The project hash if not defined at runner instantiation.
         Returns:
             None
@@ -431,30 +461,29 @@ def {fn_name}(...):
                     init_args = runner_agent.label_row_initialise_labels_args or LabelRowInitialiseLabelsArgs()
                     stage = agent_stages[runner_agent.identity]
 
-                    batch: list[AgentTask] = []
-                    batch_lrs: list[LabelRowV2 | None] = []
-
-                    tasks = list(stage.get_tasks())
+                    tasks = [t for t in stage.get_tasks() if isinstance(t, AgentTask)]
+                    batches = [tasks[i : i + task_batch_size] for i in range(0, len(tasks), task_batch_size)]
                     pbar = tqdm(desc="Executing tasks", total=len(tasks))
-                    for task in tasks:
-                        if not isinstance(task, AgentTask):
-                            continue
-                        batch.append(task)
-                        if len(batch) == task_batch_size:
-                            batch_lrs = [None] * len(batch)
-                            if runner_agent.dependant.needs_label_row:
-                                label_rows = {
-                                    UUID(lr.data_hash): lr
-                                    for lr in project.list_label_rows_v2(
-                                        data_hashes=[t.data_hash for t in batch], **include_args.model_dump()
-                                    )
-                                }
-                                batch_lrs = [label_rows.get(t.data_hash) for t in batch]
-                                with project.create_bundle() as lr_bundle:
-                                    for lr in batch_lrs:
-                                        if lr:
-                                            lr.initialise_labels(bundle=lr_bundle, **init_args.model_dump())
 
+                    # Load the label rows of the next batch in the background while
+                    # the agent works through the current one. The background thread
+                    # shares `project` (and its client session) with the agent, which
+                    # relies on the SDK's requests session being safe to use from two
+                    # threads. Label rows of batch i + 1 are therefore read before the
+                    # saves that the agent makes during batch i have landed.
+                    fetch_lrs = partial(
+                        self._get_batch_label_rows,
+                        project,
+                        runner_agent=runner_agent,
+                        include_args=include_args,
+                        init_args=init_args,
+                    )
+                    with ThreadPoolExecutor(max_workers=1) as executor:
+                        pending = [executor.submit(fetch_lrs, batches[0])] if batches else []
+                        for i, batch in enumerate(batches):
+                            batch_lrs = pending.pop().result()
+                            if i + 1 < len(batches):
+                                pending.append(executor.submit(fetch_lrs, batches[i + 1]))
                             self._execute_tasks(
                                 project,
                                 zip(batch, batch_lrs),
@@ -462,28 +491,6 @@ def {fn_name}(...):
                                 num_retries,
                                 pbar_update=pbar.update,
                             )
-
-                            batch = []
-                            batch_lrs = []
-
-                    if len(batch) > 0:
-                        batch_lrs = [None] * len(batch)
-                        if runner_agent.dependant.needs_label_row:
-                            label_rows = {
-                                UUID(lr.data_hash): lr
-                                for lr in project.list_label_rows_v2(
-                                    data_hashes=[t.data_hash for t in batch],
-                                    **include_args.model_dump(),
-                                )
-                            }
-                            batch_lrs = [label_rows[t.data_hash] for t in batch]
-                            with project.create_bundle() as lr_bundle:
-                                for lr in batch_lrs:
-                                    if lr:
-                                        lr.initialise_labels(bundle=lr_bundle, **init_args.model_dump())
-                        self._execute_tasks(
-                            project, zip(batch, batch_lrs), runner_agent, num_retries, pbar_update=pbar.update
-                        )
         except (PrintableError, AssertionError) as err:
             if self.was_called_from_cli:
                 panel = Panel(err.args[0], width=None)
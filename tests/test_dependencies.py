@@ -0,0 +1,37 @@
+from contextlib import ExitStack
+from typing import Any, Iterator
+
+from encord.project import Project
+from typing_extensions import Annotated
+
+from encord_agents.core.dependencies.models import Context, Depends
+from encord_agents.core.dependencies.utils import get_dependant, solve_dependencies
+
+
+def test_shared_dependency_is_solved_once() -> None:
+    calls: list[str] = []
+
+    def dep_shared() -> Iterator[str]:
+        calls.append("shared")
+        yield "shared"
+        calls.append("closed")
+
+    def dep_a(shared: Annotated[str, Depends(dep_shared)]) -> str:
+        return f"a({shared})"
+
+    def dep_b(shared: Annotated[str, Depends(dep_shared)]) -> str:
+        return f"b({shared})"
+
+    def agent(
+        a: Annotated[str, Depends(dep_a)],
+        b: Annotated[str, Depends(dep_b)],
+        shared: Annotated[str, Depends(dep_shared)],
+    ) -> Any:
+        pass
+
+    context = Context(project=Project.__new__(Project), label_row=None)
+    with ExitStack() as stack:
+        solved = solve_dependencies(context=context, dependant=get_dependant(func=agent), stack=stack)
+        assert solved.values == {"a": "a(shared)", "b": "b(shared)", "shared": "shared"}
+        assert calls == ["shared"]
+    assert calls == ["shared", "closed"]
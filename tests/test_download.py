@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+from typing import Any, Literal
+from uuid import uuid4
+
+import cv2
+import numpy as np
+import pytest
+from encord.constants.enums import DataType
+
+import encord_agents.core.utils as core_utils
+from encord_agents.core.data_model import FrameData
+from encord_agents.core.utils import download_frame, download_frames
+from encord_agents.fastapi.dependencies import dep_reduced_single_frame
+
+WIDTH, HEIGHT = 64, 48
+RED, BLUE = (255, 0, 0), (0, 0, 255)
+
+
+def encoded_image(suffix: str) -> bytes:
+    # Left half red, right half blue, in RGB
+    rgb = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    rgb[:, : WIDTH // 2] = RED
+    rgb[:, WIDTH // 2 :] = BLUE
+    ok, buf = cv2.imencode(suffix, cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR))
+    assert ok
+    return buf.tobytes()
+
+
+@pytest.fixture
+def image_lr(monkeypatch: pytest.MonkeyPatch, request: pytest.FixtureRequest) -> Any:
+    suffix = getattr(request, "param", ".png")
+    url = f"https://example.com/image{suffix}"
+    monkeypatch.setattr(core_utils, "_get_asset_url", lambda lr, frame: (url, False))
+    monkeypatch.setattr(core_utils, "_download_bytes", lambda url: encoded_image(suffix))
+    return SimpleNamespace(data_type=DataType.IMAGE, data_title=f"image{suffix}", data_hash="data-hash")
+
+
+@pytest.mark.parametrize("image_lr", [".png", ".jpg"], indirect=True)
+@pytest.mark.parametrize("rgb_flag", [True, False], ids=["imread-rgb", "cvtcolor-fallback"])
+@pytest.mark.parametrize("reduce_factor", [1, 2, 4, 8])
+def test_download_frame_image(
+    image_lr: Any, monkeypatch: pytest.MonkeyPatch, reduce_factor: int, rgb_flag: bool
+) -> None:
+    if rgb_flag and core_utils._IMREAD_COLOR_RGB is None:
+        pytest.skip("OpenCV cannot decode straight to RGB")
+    if not rgb_flag:
+        monkeypatch.setattr(core_utils, "_IMREAD_COLOR_RGB", None)
+
+    frame = download_frame(image_lr, 0, reduce_factor=reduce_factor)
+
+    assert frame.dtype == np.uint8
+    assert frame.shape == (HEIGHT // reduce_factor, WIDTH // reduce_factor, 3)
+    # Sample away from the edge between the halves, where JPEG blurs the colors
+    np.testing.assert_allclose(frame[0, 0], RED, atol=10)
+    np.testing.assert_allclose(frame[-1, -1], BLUE, atol=10)
+
+
+def test_download_frame_invalid_reduce_factor(image_lr: Any) -> None:
+    with pytest.raises(ValueError, match="reduce_factor"):
+        download_frame(image_lr, 0, reduce_factor=3)
+
+
+@pytest.mark.parametrize("reduce_factor", [1, 4])
+def test_dep_reduced_single_frame(image_lr: Any, reduce_factor: Literal[1, 4]) -> None:
+    frame_data = FrameData.model_validate({"projectHash": uuid4(), "dataHash": uuid4(), "frame": 0})
+    frame = dep_reduced_single_frame(reduce_factor)(image_lr, frame_data)
+
+    assert frame.shape == (HEIGHT // reduce_factor, WIDTH // reduce_factor, 3)
+    np.testing.assert_array_equal(frame[0, 0], RED)
+
+
+def test_dep_reduced_single_frame_invalid_factor() -> None:
+    with pytest.raises(ValueError, match="reduce_factor"):
+        dep_reduced_single_frame(3)  # type: ignore[arg-type]
+
+
+def test_download_frames_native_image_group(monkeypatch: pytest.MonkeyPatch) -> None:
+    lookups: list[str] = []
+
+    def get_image_urls(lr: Any) -> list[str]:
+        lookups.append(lr.data_hash)
+        return [f"https://example.com/{i}.png" for i in range(5)]
+
+    monkeypatch.setattr(core_utils, "_get_data_url", lambda lr: None)
+    monkeypatch.setattr(core_utils, "_get_image_urls", get_image_urls)
+    monkeypatch.setattr(core_utils, "_download_bytes", lambda url: encoded_image(".png"))
+    lr = SimpleNamespace(data_type=DataType.IMG_GROUP, data_title="group", data_hash="data-hash")
+
+    frames = download_frames(lr, [3, 0, 3])  # type: ignore[arg-type]
+
+    assert lookups == ["data-hash"]
+    assert sorted(frames) == [0, 3]
+    np.testing.assert_array_equal(frames[0][0, 0], RED)
@@ -0,0 +1,46 @@
+import pytest
+
+from encord_agents.cli.test import parse_editor_url
+
+PROJECT_HASH = "00000000-1111-2222-3333-444444444444"
+DATA_HASH = "55555555-6666-7777-8888-999999999999"
+
+
+@pytest.mark.parametrize(
+    "url,frame",
+    [
+        (f"https://app.encord.com/label_editor/{PROJECT_HASH}/{DATA_HASH}", 0),
+        (f"https://app.encord.com/label_editor/{PROJECT_HASH}/{DATA_HASH}/", 0),
+        (f"https://app.encord.com/label_editor/{PROJECT_HASH}/{DATA_HASH}/12", 12),
+        (f"https://app.encord.com/label_editor/{PROJECT_HASH}/{DATA_HASH}/12?other=1", 12),
+        (f"https://app.encord.com/label_editor/{PROJECT_HASH}/{DATA_HASH}?other=1#fragment", 0),
+    ],
+)
+def test_parse_editor_url(url: str, frame: int) -> None:
+    assert parse_editor_url(url) == {"projectHash": PROJECT_HASH, "dataHash": DATA_HASH, "frame": frame}
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        f"https://google.com/label_editor/{PROJECT_HASH}/{DATA_HASH}",
+        f"http://app.encord.com/label_editor/{PROJECT_HASH}/{DATA_HASH}",
+        f"https://app.encord.com/projects/{PROJECT_HASH}/{DATA_HASH}",
+        f"https://app.encord.com/label_editor/{PROJECT_HASH}",
+        f"https://app.encord.com/label_editor/{PROJECT_HASH}/not-a-data-hash",
+        f"https://app.encord.com/label_editor/{PROJECT_HASH}/{DATA_HASH}/not-a-frame",
+        f"https://app.encord.com/label_editor/{PROJECT_HASH}/{DATA_HASH}/-1",
+        f"https://app.encord.com/label_editor/{PROJECT_HASH}/{DATA_HASH}/+3",
+        f"https://app.encord.com/label_editor/{PROJECT_HASH}/{DATA_HASH}/ 7",
+        f"https://app.encord.com/label_editor/{PROJECT_HASH}/{DATA_HASH}/1_000",
+        f"https://app.encord.com/label_editor/{PROJECT_HASH}/{DATA_HASH}/٣",
+    ],
+)
+def test_parse_editor_url_rejects_illegal_urls(url: str) -> None:
+    with pytest.raises(ValueError):
+        parse_editor_url(url)
+
+
+def test_parse_editor_url_normalizes_data_hash() -> None:
+    url = f"https://app.encord.com/label_editor/{PROJECT_HASH}/{DATA_HASH.upper()}"
+    assert parse_editor_url(url)["dataHash"] == DATA_HASH
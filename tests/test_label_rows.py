@@ -0,0 +1,77 @@
+from contextlib import contextmanager
+from typing import Any, Iterator
+from uuid import UUID, uuid4
+
+import pytest
+
+import encord_agents.core.utils as core_utils
+from encord_agents.core.data_model import FrameData
+from encord_agents.core.utils import get_initialised_label_rows
+
+
+class FakeLabelRow:
+    def __init__(self, data_hash: UUID) -> None:
+        self.data_hash = str(data_hash)
+        self.initialised = False
+
+    def initialise_labels(self, bundle: Any = None, **kwargs: Any) -> None:
+        assert bundle is not None
+        self.initialised = True
+
+
+class FakeProject:
+    def __init__(self, label_rows: list[FakeLabelRow]) -> None:
+        self.label_rows = label_rows
+        self.list_calls = 0
+
+    def list_label_rows_v2(self, data_hashes: list[UUID], **kwargs: Any) -> list[FakeLabelRow]:
+        self.list_calls += 1
+        wanted = {str(h) for h in data_hashes}
+        return [lr for lr in self.label_rows if lr.data_hash in wanted]
+
+    @contextmanager
+    def create_bundle(self) -> Iterator[object]:
+        yield object()
+
+
+def frame_data(project_hash: UUID, data_hash: UUID, frame: int = 0) -> FrameData:
+    return FrameData.model_validate({"projectHash": project_hash, "dataHash": data_hash, "frame": frame})
+
+
+def patch_projects(monkeypatch: pytest.MonkeyPatch, projects: dict[UUID, FakeProject]) -> None:
+    monkeypatch.setattr(core_utils, "get_project", lambda project_hash: projects[UUID(project_hash)])
+
+
+def test_get_initialised_label_rows_keeps_input_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    p1, p2 = uuid4(), uuid4()
+    d1, d2, d3 = uuid4(), uuid4(), uuid4()
+    projects = {
+        p1: FakeProject([FakeLabelRow(d1), FakeLabelRow(d2)]),
+        p2: FakeProject([FakeLabelRow(d3)]),
+    }
+    patch_projects(monkeypatch, projects)
+
+    fds = [frame_data(p1, d2), frame_data(p2, d3), frame_data(p1, d1), frame_data(p1, d2, frame=5)]
+    lrs = get_initialised_label_rows(fds)
+
+    assert [lr.data_hash for lr in lrs] == [str(d2), str(d3), str(d1), str(d2)]
+    # Frame data pointing to the same data unit share the label row
+    assert lrs[0] is lrs[3]
+    assert all(lr.initialised for p in projects.values() for lr in p.label_rows)
+    assert [p.list_calls for p in projects.values()] == [1, 1]
+
+
+def test_get_initialised_label_rows_non_unique_match(monkeypatch: pytest.MonkeyPatch) -> None:
+    project_hash, data_hash = uuid4(), uuid4()
+    patch_projects(monkeypatch, {project_hash: FakeProject([FakeLabelRow(data_hash), FakeLabelRow(data_hash)])})
+
+    with pytest.raises(Exception, match="Non unique match"):
+        get_initialised_label_rows([frame_data(project_hash, data_hash)])
+
+
+def test_get_initialised_label_rows_unmatched(monkeypatch: pytest.MonkeyPatch) -> None:
+    project_hash, matched, unmatched = uuid4(), uuid4(), uuid4()
+    patch_projects(monkeypatch, {project_hash: FakeProject([FakeLabelRow(matched)])})
+
+    with pytest.raises(Exception, match=str(unmatched)):
+        get_initialised_label_rows([frame_data(project_hash, matched), frame_data(project_hash, unmatched)])
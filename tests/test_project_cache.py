@@ -0,0 +1,45 @@
+import time
+from typing import Any, Iterator
+
+import pytest
+
+from encord_agents.core.utils import PROJECT_CACHE_TTL_SECONDS, clear_project_cache, get_project
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def get_project(self, project_hash: str) -> Any:
+        self.calls.append(project_hash)
+        return object()
+
+
+@pytest.fixture(autouse=True)
+def empty_cache() -> Iterator[None]:
+    clear_project_cache()
+    yield
+    clear_project_cache()
+
+
+def test_get_project_is_cached_until_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    client: Any = FakeClient()
+    now = 10 * PROJECT_CACHE_TTL_SECONDS
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+
+    project = get_project("a", client=client)
+    assert get_project("a", client=client) is project
+    get_project("b", client=client)
+    assert client.calls == ["a", "b"]
+
+    now += PROJECT_CACHE_TTL_SECONDS
+    assert get_project("a", client=client) is not project
+    assert client.calls == ["a", "b", "a"]
+
+
+def test_clear_project_cache() -> None:
+    client: Any = FakeClient()
+    get_project("a", client=client)
+    clear_project_cache()
+    get_project("a", client=client)
+    assert client.calls == ["a", "a"]
@@ -0,0 +1,85 @@
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Iterator
+from unittest.mock import MagicMock
+from uuid import UUID, uuid4
+
+import pytest
+from encord.objects.ontology_labels_impl import LabelRowV2
+from encord.orm.project import ProjectType
+from encord.orm.workflow import WorkflowStageType
+from encord.workflow.stages.agent import AgentTask
+
+import encord_agents.tasks.runner as runner_module
+from encord_agents.tasks import Runner
+
+STAGE_NAME = "agent stage"
+
+
+class FakeLabelRow:
+    def __init__(self, data_hash: UUID) -> None:
+        self.data_hash = str(data_hash)
+        self.initialised = False
+
+    def initialise_labels(self, bundle: Any = None, **kwargs: Any) -> None:
+        self.initialised = True
+
+
+class FakeProject:
+    project_type = ProjectType.WORKFLOW
+
+    def __init__(self, tasks: list[AgentTask]) -> None:
+        stage = SimpleNamespace(
+            title=STAGE_NAME, uuid=uuid4(), stage_type=WorkflowStageType.AGENT, get_tasks=lambda: tasks
+        )
+        self.workflow = SimpleNamespace(stages=[stage])
+        self.listed_batches: list[list[UUID]] = []
+        self.list_threads: set[int] = set()
+
+    def list_label_rows_v2(self, data_hashes: list[UUID], **kwargs: Any) -> list[FakeLabelRow]:
+        self.listed_batches.append(list(data_hashes))
+        self.list_threads.add(threading.get_ident())
+        # Label rows are not necessarily listed in the order of the data hashes
+        return [FakeLabelRow(h) for h in reversed(data_hashes)]
+
+    @contextmanager
+    def create_bundle(self) -> Iterator[object]:
+        yield object()
+
+
+def make_task() -> Any:
+    task = MagicMock(spec=AgentTask)
+    task.data_hash = uuid4()
+    return task
+
+
+@pytest.mark.parametrize("task_batch_size", [1, 2, 10])
+def test_runner_pairs_tasks_with_their_label_rows(monkeypatch: pytest.MonkeyPatch, task_batch_size: int) -> None:
+    tasks = [make_task() for _ in range(5)]
+    project = FakeProject(tasks)
+    client = SimpleNamespace(get_project=lambda project_hash: project)
+    monkeypatch.setattr(runner_module, "get_user_client", lambda: client)
+
+    runner = Runner()
+    seen: list[tuple[Any, Any]] = []
+
+    @runner.stage(STAGE_NAME)
+    def agent(task: AgentTask, lr: LabelRowV2) -> str:
+        seen.append((task, lr))
+        return "next"
+
+    runner(project_hash=str(uuid4()), task_batch_size=task_batch_size, num_retries=0)
+
+    # Tasks are executed in order, each with the label row of its own data unit
+    assert [task for task, _ in seen] == tasks
+    assert all(lr.data_hash == str(task.data_hash) for task, lr in seen)
+    assert all(lr.initialised for _, lr in seen)
+    for task in tasks:
+        task.proceed.assert_called_once()
+    # Label rows are listed batch by batch, off the main thread
+    expected_batches = [
+        [t.data_hash for t in tasks[i : i + task_batch_size]] for i in range(0, len(tasks), task_batch_size)
+    ]
+    assert project.listed_batches == expected_batches
+    assert threading.get_ident() not in project.list_threads
@@ -0,0 +1,119 @@
+import shutil
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Iterator
+
+import cv2
+import numpy as np
+import pytest
+from encord.constants.enums import DataType
+
+import encord_agents.core.utils as core_utils
+from encord_agents.core.utils import download_frame
+from encord_agents.core.video import (
+    ensure_video_label_row,
+    get_frame,
+    get_frames,
+    iter_video,
+    prefetch_iter,
+    prefetched_video_frames,
+)
+from encord_agents.fastapi.dependencies import dep_frames
+
+NUM_FRAMES = 12
+
+
+@pytest.fixture(scope="module")
+def video_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    path = tmp_path_factory.mktemp("video") / "video.avi"
+    writer = cv2.VideoWriter(path.as_posix(), cv2.VideoWriter.fourcc(*"MJPG"), 10, (64, 48))
+    for i in range(NUM_FRAMES):
+        writer.write(np.full((48, 64, 3), i * 20, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def test_get_frames(video_path: Path) -> None:
+    frames = get_frames(video_path, [7, 0, 3, 7])
+    assert sorted(frames) == [0, 3, 7]
+    for frame_num, content in frames.items():
+        np.testing.assert_array_equal(content, get_frame(video_path, frame_num))
+
+
+def test_get_frames_out_of_range(video_path: Path) -> None:
+    with pytest.raises(Exception, match=str(NUM_FRAMES + 5)):
+        get_frames(video_path, [1, NUM_FRAMES + 5])
+
+
+def test_prefetch_iter(video_path: Path) -> None:
+    frames = list(prefetch_iter(iter_video(video_path), n=2))
+    assert [f.frame for f in frames] == list(range(NUM_FRAMES))
+    for f in frames[::5]:
+        np.testing.assert_array_equal(f.content, get_frame(video_path, f.frame))
+
+
+def test_prefetch_iter_stops_early() -> None:
+    produced: list[int] = []
+
+    def numbers() -> Iterator[int]:
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    frames = prefetch_iter(numbers(), n=2)
+    assert next(frames) == 0
+    frames.close()
+    # The producer never runs much further ahead than the prefetch size
+    assert len(produced) <= 4
+
+
+def test_prefetch_iter_reraises() -> None:
+    def failing() -> Iterator[int]:
+        yield 1
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        list(prefetch_iter(failing()))
+
+
+@pytest.mark.parametrize("data_type", [DataType.VIDEO, DataType.IMG_GROUP], ids=["video", "image-sequence"])
+def test_dep_frames(video_path: Path, monkeypatch: pytest.MonkeyPatch, data_type: DataType) -> None:
+    downloads: list[str] = []
+
+    def download_to_file(url: str, file_path: Path) -> None:
+        downloads.append(url)
+        shutil.copy(video_path, file_path)
+
+    url = "https://example.com/asset"
+    monkeypatch.setattr(core_utils, "_get_data_url", lambda lr: url)
+    monkeypatch.setattr(core_utils, "_download_to_file", download_to_file)
+
+    lr = SimpleNamespace(data_type=data_type, data_title="asset", data_hash="data-hash")
+    frames = dep_frames([7, 0, 3, 7])(lr)  # type: ignore[arg-type]
+
+    assert downloads == [url]
+    assert sorted(frames) == [0, 3, 7]
+    for frame_num, content in frames.items():
+        np.testing.assert_array_equal(content, get_frame(video_path, frame_num))
+
+
+def test_download_frame_video(video_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(core_utils, "_get_asset_url", lambda lr, frame: ("https://example.com/video.avi", False))
+    monkeypatch.setattr(core_utils, "_download_to_file", lambda url, file_path: shutil.copy(video_path, file_path))
+    lr = SimpleNamespace(data_type=DataType.VIDEO, data_title="video.avi", data_hash="data-hash")
+
+    frame = download_frame(lr, 5)  # type: ignore[arg-type]
+
+    np.testing.assert_array_equal(frame, get_frame(video_path, 5))
+
+
+def test_prefetched_video_frames(video_path: Path) -> None:
+    with prefetched_video_frames(video_path) as frames:
+        assert [f.frame for f in frames] == list(range(NUM_FRAMES))
+
+
+def test_ensure_video_label_row() -> None:
+    video: Any = SimpleNamespace(data_type=DataType.VIDEO)
+    assert ensure_video_label_row(video) is video
+    with pytest.raises(NotImplementedError):
+        ensure_video_label_row(SimpleNamespace(data_type=DataType.IMAGE))  # type: ignore[arg-type]
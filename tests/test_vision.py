@@ -0,0 +1,82 @@
+from typing import cast
+
+import cv2
+import numpy as np
+import pytest
+from encord.objects.bitmask import BitmaskCoordinates
+from encord.objects.coordinates import PointCoordinate, PolygonCoordinates, RotatableBoundingBoxCoordinates
+from numpy.typing import NDArray
+
+from encord_agents.core.vision import mask_to_bbox, poly_to_bbox, rbb_to_poly, rbbox_to_surrounding_bbox
+
+IMG_WIDTH = 640
+IMG_HEIGHT = 480
+
+
+def rbb_to_poly_reference(rbb: RotatableBoundingBoxCoordinates, img_width: int, img_height: int) -> NDArray[np.float32]:
+    x, y, w, h = rbb.top_left_x, rbb.top_left_y, rbb.width, rbb.height
+    corners = np.array(
+        [
+            [x * img_width, y * img_height],
+            [(x + w) * img_width, y * img_height],
+            [(x + w) * img_width, (y + h) * img_height],
+            [x * img_width, (y + h) * img_height],
+        ]
+    )
+    center = tuple(corners.mean(0).tolist())
+    rotation_matrix = cv2.getRotationMatrix2D(center, 360 - rbb.theta, scale=1.0)
+    poly = np.pad(corners, [(0, 0), (0, 1)], constant_values=1) @ rotation_matrix.T
+    return cast(NDArray[np.float32], np.asarray(poly, dtype=np.float32))
+
+
+@pytest.mark.parametrize("theta", [0, 15, 45, 90, 135.5, 180, 270, 300, 359.9])
+def test_rbb_to_poly(theta: float) -> None:
+    rbb = RotatableBoundingBoxCoordinates(top_left_x=0.2, top_left_y=0.3, width=0.4, height=0.1, theta=theta)
+    poly = rbb_to_poly(rbb, img_width=IMG_WIDTH, img_height=IMG_HEIGHT)
+    assert poly.shape == (4, 2)
+    assert poly.dtype == np.float32
+    assert np.allclose(poly, rbb_to_poly_reference(rbb, IMG_WIDTH, IMG_HEIGHT), atol=1e-3)
+
+
+@pytest.mark.parametrize(
+    "rows,cols",
+    [
+        (slice(1, 3), slice(2, 7)),
+        (slice(0, 48), slice(0, 64)),
+        (slice(47, 48), slice(10, 11)),
+    ],
+)
+def test_mask_to_bbox(rows: slice, cols: slice) -> None:
+    mask = np.zeros((48, 64), dtype=bool)
+    mask[rows, cols] = True
+    for bbox in [mask_to_bbox(BitmaskCoordinates(mask)), mask_to_bbox(mask)]:
+        assert bbox.top_left_x == pytest.approx(cols.start / 64)
+        assert bbox.top_left_y == pytest.approx(rows.start / 48)
+        assert bbox.width == pytest.approx((cols.stop - cols.start) / 64)
+        assert bbox.height == pytest.approx((rows.stop - rows.start) / 48)
+
+
+def test_mask_to_bbox_empty_mask() -> None:
+    with pytest.raises(ValueError):
+        mask_to_bbox(BitmaskCoordinates(np.zeros((48, 64), dtype=bool)))
+
+
+def test_poly_to_bbox() -> None:
+    points = [(0.2, 0.4), (0.6, 0.1), (0.5, 0.9), (0.1, 0.5)]
+    poly = PolygonCoordinates(values=[PointCoordinate(x=x, y=y) for x, y in points])
+    for bbox in [poly_to_bbox(poly), poly_to_bbox(np.array(points, dtype=np.float32))]:
+        assert bbox.top_left_x == pytest.approx(0.1)
+        assert bbox.top_left_y == pytest.approx(0.1)
+        assert bbox.width == pytest.approx(0.5)
+        assert bbox.height == pytest.approx(0.8)
+
+
+@pytest.mark.parametrize("theta", [0, 30, 90, 180, 210, 270, 360])
+def test_rbbox_to_surrounding_bbox(theta: float) -> None:
+    rbb = RotatableBoundingBoxCoordinates(top_left_x=0.2, top_left_y=0.3, width=0.4, height=0.1, theta=theta)
+    bbox = rbbox_to_surrounding_bbox(rbb, img_w=IMG_WIDTH, img_h=IMG_HEIGHT)
+    expected = poly_to_bbox(rbb_to_poly_reference(rbb, IMG_WIDTH, IMG_HEIGHT) / np.array([[IMG_WIDTH, IMG_HEIGHT]]))
+    assert bbox.top_left_x == pytest.approx(expected.top_left_x, abs=1e-6)
+    assert bbox.top_left_y == pytest.approx(expected.top_left_y, abs=1e-6)
+    assert bbox.width == pytest.approx(expected.width, abs=1e-6)
+    assert bbox.height == pytest.approx(expected.height, abs=1e-6)